@@ -2,8 +2,8 @@ import dash
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 import pandas as pd
-import requests
-from dash.dependencies import Input, Output, State
+import upstream
+from dash.dependencies import ClientsideFunction, Input, Output, State
 import plotly.graph_objs as go
 from pytz import timezone
 from yahoo_fin import news
@@ -14,8 +14,25 @@ import dash_daq as daq
 from dash.exceptions import PreventUpdate
 from bs4 import BeautifulSoup
 import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import jsonify
 from utilities import *
 from charts import *
+from quote_cache import get_quote, quote_stats
+from market_session import get_market_status
+from history_store import get_history
+from singleflight import coalesced, singleflight_stats
+from snapshot import load_snapshot, save_snapshot
+from poller import start_poller, poller_stats
+from intraday import get_intraday
+from fundamentals import cached_fundamental, fundamentals_stats
+from indicator_cache import indicator_cache_stats
+from risk_metrics import get_risk_metrics
+from downsample import zoom_range
+from figures import figure, indicator
 
 
 app = dash.Dash(
@@ -32,6 +49,19 @@ app.title = "Eulera Dashboard"
 server = app.server
 
 
+@server.route("/stats")
+def upstream_stats():
+    return jsonify(
+        {
+            "quotes": quote_stats(),
+            "singleflight": singleflight_stats(),
+            "poller": poller_stats(),
+            "fundamentals": fundamentals_stats(),
+            "indicators": indicator_cache_stats(),
+        }
+    )
+
+
 conf_graph = {
     "scrollZoom": True,
     "displaylogo": False,
@@ -42,8 +72,13 @@ conf_graph = {
 }
 
 
+@coalesced
+def fetch_news(company):
+    return news.get_yf_rss(company)
+
+
 def update_news(company):
-    list_news = news.get_yf_rss(company)
+    list_news = fetch_news(company)
     df = pd.DataFrame(list_news)[["title", "link"]]
     max_rows = 10
     return html.Div(
@@ -87,8 +122,8 @@ def update_news(company):
     )
 
 
-def get_top_bar_cell(cellTitle, cellValue):
-    if cellValue is None:
+def get_top_bar_cell(cellTitle, cellValue, star=True):
+    if cellValue is None or cellValue != cellValue:
         cellValue = "--"
     else:
         cellValue = "%.4f" % cellValue
@@ -97,7 +132,9 @@ def get_top_bar_cell(cellTitle, cellValue):
         children=[
             html.P(
                 className="p-top-bar",
-                children=[cellTitle, html.Span("*", className="star")],
+                children=[cellTitle, html.Span("*", className="star")]
+                if star
+                else cellTitle,
             ),
             html.P(id=cellTitle, className="display-none", children=cellValue),
             html.P(children=cellValue, className="f-ratios"),
@@ -105,26 +142,60 @@ def get_top_bar_cell(cellTitle, cellValue):
     )
 
 
-def get_top_bar(company):
-    headers = {"User-Agent": rand_agent("assets/user-agents.txt")}
+@cached_fundamental("ratios")
+@coalesced
+def fetch_ratios(company):
     url = (
         "https://financialmodelingprep.com/api/v3/ratios-ttm/"
         + company
         + "?apikey=fdcb26b779c637247be2e6d28d760cee"
     )
-    ratios_requests = requests.get(url, headers=headers)
-    json_data = ratios_requests.json()[0]
+    ratios_requests = upstream.get(url)
+    return ratios_requests.json()[0]
+
+
+top_bar_ratios = [
+    ("Quick Ratio", "quickRatioTTM"),
+    ("Price to earnings", "priceEarningsRatioTTM"),
+    ("Debt-to-equity", "debtEquityRatioTTM"),
+    ("Gross Margin", "grossProfitMarginTTM"),
+    ("Net Profit Margin", "netProfitMarginTTM"),
+    ("Inventory Turnover", "inventoryTurnoverTTM"),
+]
+
 
+def top_bar_cells(json_data):
     return [
-        get_top_bar_cell("Quick Ratio", json_data["quickRatioTTM"]),
-        get_top_bar_cell("Price to earnings", json_data["priceEarningsRatioTTM"]),
-        get_top_bar_cell("Debt-to-equity", json_data["debtEquityRatioTTM"]),
-        get_top_bar_cell("Gross Margin", json_data["grossProfitMarginTTM"]),
-        get_top_bar_cell("Net Profit Margin", json_data["netProfitMarginTTM"]),
-        get_top_bar_cell("Inventory Turnover", json_data["inventoryTurnoverTTM"]),
+        get_top_bar_cell(title, json_data.get(key)) for title, key in top_bar_ratios
     ]
 
 
+def get_top_bar(company):
+    return top_bar_cells(fetch_ratios(company))
+
+
+risk_bar_metrics = [
+    ("1Y Return", "return"),
+    ("Volatility", "volatility"),
+    ("Max Drawdown", "max_drawdown"),
+    ("Sharpe Ratio", "sharpe"),
+    ("Sortino Ratio", "sortino"),
+    ("Beta (S&P 500)", "beta"),
+]
+
+
+def risk_bar_cells(metrics):
+    return [
+        get_top_bar_cell(title, metrics.get(key), star=False)
+        for title, key in risk_bar_metrics
+    ]
+
+
+def get_risk_bar(company):
+    universe = [c["value"] for c in companies]
+    return risk_bar_cells(get_risk_metrics(company, universe))
+
+
 def market_status():
     try:
         dt = datetime.now(timezone("America/New_York"))
@@ -132,7 +203,7 @@ def market_status():
         r_time = datetime.strptime(dt.strftime("%H:%M:%S"), "%H:%M:%S")
         open_time = datetime.strptime("09:31:00", "%H:%M:%S")
         close_time = datetime.strptime("16:01:00", "%H:%M:%S")
-        stat = si.get_market_status()
+        stat = get_market_status()
 
         if stat == "CLOSED":
             return html.P(
@@ -317,7 +388,7 @@ f_elements = [
 
 
 def get_finance_infos(company):
-    data_infos = Ticker(company).quotes[company]
+    data_infos = get_quote(company)
     for e in f_elements:
         if e not in data_infos.keys():
             data_infos[e] = "--"
@@ -483,9 +554,17 @@ def get_finance_infos(company):
     ]
 
 
+# yahooquery returns an error string instead of the scores of a symbol
+# without ESG data
+@cached_fundamental("esg", valid=lambda scores: isinstance(scores, dict))
+@coalesced
+def fetch_esg(company):
+    return Ticker(company).esg_scores[company]
+
+
 def get_esg_score(company):
     try:
-        esg_data = Ticker(company).esg_scores[company]
+        esg_data = fetch_esg(company)
         return [
             html.Div(
                 children=html.P(
@@ -549,9 +628,14 @@ def get_esg_score(company):
         return html.P("feature not available", className="f-notav2")
 
 
+@coalesced
+def fetch_currencies():
+    return si.get_currencies()
+
+
 def get_currencies():
     try:
-        data = si.get_currencies()
+        data = fetch_currencies()
         items = []
         for i in range(4):
             d = data[i * 6 : 6 * (i + 1)]
@@ -569,14 +653,17 @@ def get_currencies():
         ]
 
 
+@cached_fundamental("rating")
+@coalesced
+def fetch_rating(company):
+    url = "https://query1.finance.yahoo.com/v7/finance/quote?symbols=" + company
+    rating_requests = upstream.get(url)
+    return rating_requests.json()["quoteResponse"]["result"][0]["averageAnalystRating"]
+
+
 def get_recomm_rating(company):
     try:
-        headers = {"User-Agent": rand_agent("assets/user-agents.txt")}
-        url = "https://query1.finance.yahoo.com/v7/finance/quote?symbols=" + company
-        rating_requests = requests.get(url, headers=headers)
-        str_rating = rating_requests.json()["quoteResponse"]["result"][0][
-            "averageAnalystRating"
-        ]
+        str_rating = fetch_rating(company)
         return daq.Slider(
             min=1,
             max=5,
@@ -606,69 +693,26 @@ def get_recomm_rating(company):
 
 def get_pre_post_post(company):
     try:
-        status = si.get_market_status()
+        status = get_market_status()
         url = "https://finance.yahoo.com/quote/" + company + "?p=" + company
-        headers = {"User-Agent": rand_agent("assets/user-agents.txt")}
-        resp = requests.get(url=url, headers=headers)
+        resp = upstream.get(url)
         soup = BeautifulSoup(resp.text, "lxml")
         if status == "PRE" or status == "POSTPOST" or status == "POST":
 
             div = soup.find("span", {"class": "C($primaryColor) Fz(24px) Fw(b)"})
             price = float(div.text.replace(",", ""))
-            prev = Ticker(company).history(
-                period="1d", interval="1d", adj_timezone=False
-            )
-            prev = prev.loc[company]
-            prev = prev.iloc[-1].close
+            prev = get_history(company, "1d").iloc[-1].close
         else:
             div = soup.find(
                 "span", {"class": "Trsdu(0.3s) Fw(b) Fz(36px) Mb(-4px) D(ib)"}
             )
             price = float(div.text.replace(",", ""))
-            prev = Ticker(company).quotes[company]["regularMarketPreviousClose"]
+            prev = get_quote(company)["regularMarketPreviousClose"]
     except AttributeError:
         price = None
         prev = None
 
-    fig = go.Figure(
-        data=[
-            go.Indicator(
-                mode="number+delta",
-                value=price,
-                delta={
-                    "reference": prev,
-                    "valueformat": ".2f",
-                    "position": "bottom",
-                    "font": {
-                        "color": "#b2b2b2",
-                        "size": 15,
-                        "family": "Trebuchet MS, sans-serif",
-                    },
-                },
-                align="center",
-                number={
-                    "valueformat": ".3f",
-                    "font": {
-                        "color": "#acacad",
-                        "size": 25,
-                        "family": "Trebuchet MS, sans-serif",
-                    },
-                },
-            )
-        ]
-    )
-    fig.update_layout(
-        width=100,
-        height=60,
-        margin={"t": 10, "l": 10, "b": 10, "r": 10},
-        autosize=True,
-        paper_bgcolor="#22252b",
-        plot_bgcolor="#22252b",
-        hoverlabel={
-            "align": "auto",
-            "font": {"color": "#ededed", "size": 8},
-        },
-    )
+    fig = figure("pre_post", [indicator("pre_post", price, prev)])
     return dcc.Graph(
         id="pre_post_price",
         style={"display": "inline-flex"},
@@ -682,6 +726,40 @@ def get_pre_post_post(company):
     )
 
 
+def placeholder_figure(bgcolor="#22252b"):
+    return figure("placeholder", [], paper_bgcolor=bgcolor, plot_bgcolor=bgcolor)
+
+
+companies = [
+    {"label": "Apple, Inc", "value": "AAPL"},
+    {"label": "Facebook, Inc", "value": "FB"},
+    {"label": "Tesla, Inc", "value": "TSLA"},
+    {"label": "Amazon, Inc", "value": "AMZN"},
+    {"label": "Google, Inc", "value": "GOOG"},
+    {"label": "Twitter, Inc", "value": "TWTR"},
+    {"label": "Netflix, Inc", "value": "NFLX"},
+]
+
+
+# The layout is built without any upstream call: panels come from the last
+# persisted snapshot or placeholders, and the page load callbacks fill in
+# live values.
+boot_panels = {
+    "pre_post_p": html.P("--", className="f-notav1"),
+    "news": html.P(className="p-news", children="Headlines"),
+    "top_bar": top_bar_cells({}),
+    "risk_bar": risk_bar_cells({}),
+    "charts": placeholder_figure(),
+    "currencies": [{"key": "1", "alt": "--"}],
+    "finance_info": [],
+    "realtime_chart": placeholder_figure(),
+    "recomm_rating": html.P("--", className="f-notav1"),
+    "esg_scores": html.P("--", className="f-notav2"),
+    "price_indicator": placeholder_figure("#1d1e22"),
+    "history_chart": placeholder_figure("#1d1e22"),
+}
+boot_panels.update(load_snapshot())
+
 df = pd.read_csv("history.csv", index_col=0)
 
 app.layout = html.Div(
@@ -691,7 +769,13 @@ app.layout = html.Div(
         dcc.Interval(id="i_price_infos", interval=30000),  # 30sec
         dcc.Interval(id="i_stat_curren", interval=20000),  # 20sec
         dcc.Interval(id="i_rtchart", interval=40000),  # 40s
+        dcc.Store(id="rt_figure"),
+        dcc.Store(id="rt_delta"),
         dcc.Interval(id="i_mainchart", interval=400 * 100000),  # 11.11h
+        dcc.Store(id="chart_zoom"),
+        dcc.Store(id="chart_parts"),
+        dcc.Store(id="chart_cache"),
+        dcc.Store(id="chart_loaded"),
         dcc.Interval(id="i_update_model", interval=1000),  # 1s
         dcc.Interval(id="i_pre_post", interval=3000),  # 5s
         html.Div(
@@ -889,7 +973,7 @@ app.layout = html.Div(
                             children=[
                                 html.Div(children=market_status(), id="market-status"),
                                 html.Div(
-                                    children=get_pre_post_post("AAPL"), id="pre_post_p"
+                                    children=boot_panels["pre_post_p"], id="pre_post_p"
                                 ),
                                 html.Div(id="test", style={"display": "none"}),
                                 dbc.Button(
@@ -943,10 +1027,9 @@ app.layout = html.Div(
                                                                                     style={
                                                                                         "display": "inline-flex"
                                                                                     },
-                                                                                    figure=indc_price(
-                                                                                        0,
-                                                                                        "AAPL",
-                                                                                    ),
+                                                                                    figure=boot_panels[
+                                                                                        "price_indicator"
+                                                                                    ],
                                                                                     config={
                                                                                         "scrollZoom": True,
                                                                                         "displaylogo": False,
@@ -984,9 +1067,9 @@ app.layout = html.Div(
                                                                 dcc.Graph(
                                                                     id="history_chart",
                                                                     className="chart-graph",
-                                                                    figure=model_chart(
-                                                                        "AAPL", df
-                                                                    ),
+                                                                    figure=boot_panels[
+                                                                        "history_chart"
+                                                                    ],
                                                                     config={
                                                                         "scrollZoom": True,
                                                                         "displaylogo": False,
@@ -1030,15 +1113,7 @@ app.layout = html.Div(
                                 dcc.Dropdown(
                                     className="",
                                     id="dropdown_corp",
-                                    options=[
-                                        {"label": "Apple, Inc", "value": "AAPL"},
-                                        {"label": "Facebook, Inc", "value": "FB"},
-                                        {"label": "Tesla, Inc", "value": "TSLA"},
-                                        {"label": "Amazon, Inc", "value": "AMZN"},
-                                        {"label": "Google, Inc", "value": "GOOG"},
-                                        {"label": "Twitter, Inc", "value": "TWTR"},
-                                        {"label": "Netflix, Inc", "value": "NFLX"},
-                                    ],
+                                    options=companies,
                                     value="AAPL",
                                     clearable=False,
                                     searchable=False,
@@ -1059,7 +1134,7 @@ app.layout = html.Div(
                     children=[
                         html.Div(
                             id="news",
-                            children=update_news("AAPL"),
+                            children=boot_panels["news"],
                             className="alignnews",
                             style={
                                 "display": "flex",
@@ -1077,7 +1152,7 @@ app.layout = html.Div(
                 html.Div(
                     id="top_bar",
                     className="row div-top-bar",
-                    children=get_top_bar("AAPL"),
+                    children=boot_panels["top_bar"],
                 ),
                 html.Div(
                     style=dict(float="right"),
@@ -1093,6 +1168,11 @@ app.layout = html.Div(
                         className="note-ratios",
                     ),
                 ),
+                html.Div(
+                    id="risk_bar",
+                    className="row div-top-bar",
+                    children=boot_panels["risk_bar"],
+                ),
                 html.Div(
                     className="wrapper",
                     children=[
@@ -1264,14 +1344,14 @@ app.layout = html.Div(
                     dcc.Graph(
                         id="charts",
                         className="chart-graph",
-                        figure=main_chart("AAPL", [], "1mo", "ohlc_trace"),
+                        figure=boot_panels["charts"],
                         config=conf_graph,
                     ),
                     className="ohlc",
                 ),
                 html.Div(
                     dbc.Carousel(
-                        items=get_currencies(),
+                        items=boot_panels["currencies"],
                         controls=False,
                         indicators=False,
                         interval=5000,
@@ -1282,7 +1362,7 @@ app.layout = html.Div(
                     className="fnews",
                 ),
                 html.Div(
-                    children=get_finance_infos("AAPL"),
+                    children=boot_panels["finance_info"],
                     className="cc",
                     id="finance_info",
                 ),
@@ -1290,7 +1370,7 @@ app.layout = html.Div(
                     dcc.Graph(
                         id="realtime_chart",
                         className="rt",
-                        figure=rt_chart("AAPL"),
+                        figure=boot_panels["realtime_chart"],
                         config=conf_graph,
                     ),
                     className="cc_",
@@ -1301,7 +1381,7 @@ app.layout = html.Div(
                             [
                                 html.P("Recommendation Rating", className="tit_div"),
                                 html.Div(
-                                    children=get_recomm_rating("AAPL"),
+                                    children=boot_panels["recomm_rating"],
                                     className="rating",
                                     id="recomm_rating",
                                     style={
@@ -1322,7 +1402,7 @@ app.layout = html.Div(
                                     className="",
                                 ),
                                 html.Div(
-                                    children=get_esg_score("AAPL"),
+                                    children=boot_panels["esg_scores"],
                                     className="div-scores",
                                     id="esg_scores",
                                 ),
@@ -1344,6 +1424,27 @@ app.layout = html.Div(
 )
 
 
+PANEL_DEADLINE = 6
+panel_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="panels")
+
+
+def fetch_panels(panels, company):
+    # Builds every panel concurrently, a panel that fails or misses its
+    # deadline (in seconds from the start) falls back to its placeholder.
+    start = time.monotonic()
+    futures = [panel_pool.submit(build, company) for build, _, _ in panels]
+    results = []
+    for future, (_, fallback, deadline) in zip(futures, panels):
+        try:
+            results.append(
+                future.result(timeout=max(0, deadline - (time.monotonic() - start)))
+            )
+        except Exception:
+            future.cancel()
+            results.append(fallback)
+    return results
+
+
 @app.callback(
     Output("news", "children"),
     [Input("i_news", "n_intervals"), Input("dropdown_corp", "value")],
@@ -1353,17 +1454,67 @@ def update__news__rating(n, dropdown_corp):
 
 
 @app.callback(
-    Output("charts", "figure"),
+    Output("chart_parts", "data"),
     [
         Input("i_mainchart", "n_intervals"),
         Input("dropdown_corp", "value"),
         Input("studies", "value"),
         Input("duration", "value"),
         Input("styles", "value"),
+        Input("chart_zoom", "data"),
     ],
+    [State("chart_loaded", "data")],
+)
+def update_mainchart(n, dropdown_corp, studies, duration, styles, zoom, loaded):
+    # Toggling a study the browser already has, or unchecking one, stays in
+    # assets/charts.js. A newly checked study only sends its own traces.
+    studies = studies or []
+    input_id = dash.callback_context.triggered[0]["prop_id"].split(".")[0]
+    if (
+        input_id == "studies"
+        and loaded
+        and loaded["key"] == chart_key(dropdown_corp, duration, zoom)
+    ):
+        missing = [i for i in studies if i not in loaded["studies"]]
+        if not missing:
+            raise PreventUpdate
+        return main_chart_studies(dropdown_corp, duration, missing, zoom)
+    return main_chart_parts(dropdown_corp, duration, styles, studies, zoom)
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace="charts", function_name="merge"),
+    [Output("chart_cache", "data"), Output("chart_loaded", "data")],
+    [Input("chart_parts", "data")],
+    [State("chart_cache", "data")],
 )
-def update_mainchart(n, dropdown_corp, studies, duration, styles):
-    return main_chart(dropdown_corp, studies, duration, styles)
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace="charts", function_name="assemble"),
+    Output("charts", "figure"),
+    [Input("chart_cache", "data"), Input("studies", "value")],
+)
+
+
+@app.callback(
+    Output("chart_zoom", "data"),
+    [
+        Input("charts", "relayoutData"),
+        Input("dropdown_corp", "value"),
+        Input("duration", "value"),
+    ],
+)
+def update_chart_zoom(relayout, dropdown_corp, duration):
+    # zooming re-requests the main chart at the resolution of the visible
+    # span, a new ticker or duration starts unzoomed
+    input_id = dash.callback_context.triggered[0]["prop_id"].split(".")[0]
+    if input_id != "charts":
+        return None
+    x_range = zoom_range(relayout)
+    if x_range is False:
+        raise PreventUpdate
+    return x_range
 
 
 # CALLBACK TOP BAR - ESG RISK SCORES - COMPANY COORDS - RECOMMENDATION RATING
@@ -1372,6 +1523,7 @@ def update_mainchart(n, dropdown_corp, studies, duration, styles):
 @app.callback(
     [
         Output("top_bar", "children"),
+        Output("risk_bar", "children"),
         Output("esg_scores", "children"),
         Output("info-company", "children"),
         Output("recomm_rating", "children"),
@@ -1381,12 +1533,18 @@ def update_mainchart(n, dropdown_corp, studies, duration, styles):
     ],
 )
 def update__topbar__esg__infos(dropdown_corp):
-    return [
-        get_top_bar(dropdown_corp),
-        get_esg_score(dropdown_corp),
-        get_company_infos(dropdown_corp),
-        get_recomm_rating(dropdown_corp),
-    ]
+    esg_fallback = html.P("feature not available", className="f-notav2")
+    rating_fallback = html.P("feature not available", className="f-notav1")
+    return fetch_panels(
+        [
+            (get_top_bar, top_bar_cells({}), PANEL_DEADLINE),
+            (get_risk_bar, risk_bar_cells({}), PANEL_DEADLINE),
+            (get_esg_score, esg_fallback, PANEL_DEADLINE),
+            (get_company_infos, [], PANEL_DEADLINE),
+            (get_recomm_rating, rating_fallback, PANEL_DEADLINE),
+        ],
+        dropdown_corp,
+    )
 
 
 @app.callback(
@@ -1412,25 +1570,49 @@ def toggle_collapse(n, is_open):
 
 
 @app.callback(
-    Output("realtime_chart", "figure"),
+    [Output("rt_figure", "data"), Output("rt_delta", "data")],
     [Input("i_rtchart", "n_intervals"), Input("dropdown_corp", "value")],
+    [State("rt_delta", "data")],
 )
-def update__rtchart(n, dropdown_corp):
+def update__rtchart(n, dropdown_corp, delta):
 
-    status = si.get_market_status()
-    data = Ticker(dropdown_corp).history(period="1d", interval="1m", adj_timezone=False)
+    status = get_market_status()
+    data = get_intraday(dropdown_corp)
     input_id = dash.callback_context.triggered[0]["prop_id"].split(".")[0]
 
     if (
-        isinstance(data, dict)
+        data is None
         or status == "PRE"
         or status == "CLOSED"
         or status == "POSTPOST"
         or status == "POST"
     ) and input_id == "i_rtchart":
         raise PreventUpdate
-    else:
-        return rt_chart(dropdown_corp)
+    if data is None:
+        # no minutes yet for this ticker, e.g. before the poller's first cycle
+        return placeholder_figure(), {"company": dropdown_corp}
+    if (
+        input_id == "i_rtchart"
+        and delta
+        and delta.get("company") == dropdown_corp
+        and rt_delta_fits(data, delta.get("last"))
+    ):
+        # ticks only send the minutes the browser does not have yet, unless a
+        # study line or the volume profile appeared since the figure was sent
+        new = rt_delta(dropdown_corp, delta["last"], delta.get("traces", ()))
+        if new["traces"] == delta.get("traces"):
+            return dash.no_update, new
+    fig = rt_chart(dropdown_corp)
+    last = int(fig["data"][0]["x"].iloc[-1])
+    return fig, {"company": dropdown_corp, "last": last, "traces": rt_traces(fig)}
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace="realtime", function_name="apply_delta"),
+    Output("realtime_chart", "figure"),
+    [Input("rt_figure", "data"), Input("rt_delta", "data")],
+    [State("realtime_chart", "figure")],
+)
 
 
 @app.callback(
@@ -1449,7 +1631,7 @@ def update__status__currencies(n):
     [Input("i_price_infos", "n_intervals"), Input("dropdown_corp", "value")],
 )
 def update__finfo(n, dropdown_corp):
-    status = si.get_market_status()
+    status = get_market_status()
     input_id = dash.callback_context.triggered[0]["prop_id"].split(".")[0]
 
     if (
@@ -1500,10 +1682,11 @@ model_history = pd.DataFrame(columns=["date", "min_conf", "max_conf", "f_price"]
 )
 def update_forecast(dropdown_corp, is_open):
     df = pd.read_csv("history.csv", index_col=0)
-    response = requests.post(
+    response = upstream.post(
             "http://euleraapi.herokuapp.com/predict",
             headers={"Content-Type": "application/json"},
             data=json.dumps(dict(ticker=dropdown_corp)),
+            timeout=upstream.MODEL_TIMEOUT,
         )
 
     if is_open and dropdown_corp == "AAPL" and response.status_code == 200:
@@ -1555,12 +1738,13 @@ def update_modelt(n):
         and dt.minute == update_time.minute
         and dt.second == update_time.second
     ):
-        status = si.get_market_status()
+        status = get_market_status()
         if status == "POSTPOST" or status == "POST":
-            response = requests.post(
+            response = upstream.post(
                 "http://euleraapi.herokuapp.com/update",
                 headers={"Content-Type": "application/json"},
                 data=json.dumps(dict(ticker="AAPL")),
+                timeout=upstream.MODEL_TIMEOUT,
             )
             # print(dt,'\t',response.text, 'MODEL UPDATED \t AAPL')
     else:
@@ -1575,5 +1759,37 @@ def update_pre_post_price(n, dropdown_corp):
     return get_pre_post_post(dropdown_corp)
 
 
+def prewarm(company="AAPL"):
+    builders = {
+        "pre_post_p": lambda: get_pre_post_post(company),
+        "news": lambda: update_news(company),
+        "top_bar": lambda: get_top_bar(company),
+        "risk_bar": lambda: get_risk_bar(company),
+        "charts": lambda: main_chart(company, [], "1mo", "ohlc_trace"),
+        "currencies": get_currencies,
+        "finance_info": lambda: get_finance_infos(company),
+        "realtime_chart": lambda: rt_chart(company),
+        "recomm_rating": lambda: get_recomm_rating(company),
+        "esg_scores": lambda: get_esg_score(company),
+        "price_indicator": lambda: indc_price(0, company),
+        "history_chart": lambda: model_chart(company, df),
+    }
+    panels = {}
+    for name, build in builders.items():
+        try:
+            panels[name] = build()
+        except Exception:
+            continue
+    if panels:
+        save_snapshot(panels)
+
+
+if os.environ.get("EULERA_PREWARM", "1") == "1":
+    threading.Thread(target=prewarm, daemon=True).start()
+
+if os.environ.get("EULERA_POLLER", "1") == "1":
+    start_poller([c["value"] for c in companies])
+
+
 if __name__ == "__main__":
     app.run_server(debug=False)
@@ -0,0 +1,92 @@
+// Builds the main chart from the study traces cached in the browser
+// (chart_cache) and the checked studies, so that toggling a study the
+// browser already has does not go back to the server. The cache is filled
+// from chart_parts: charts.main_chart_parts for a new ticker, duration,
+// style or zoom, charts.main_chart_studies for studies checked later.
+// assemble mirrors charts.assemble_chart and figures.figure.
+
+function subplotAxes(rows, spacing) {
+    // the stacked rows of figures.subplot_axes
+    var height = (1 - spacing * (rows - 1)) / rows;
+    var grid = {};
+    for (var row = 1; row <= rows; row++) {
+        var suffix = row === 1 ? "" : String(row);
+        var top = 1 - (row - 1) * (height + spacing);
+        grid["xaxis" + suffix] = {anchor: "y" + suffix, domain: [0.0, 1.0]};
+        grid["yaxis" + suffix] = {
+            anchor: "x" + suffix,
+            domain: [Math.max(top - height, 0.0), top],
+        };
+        if (row < rows) {
+            grid["xaxis" + suffix].matches = "x" + rows;
+            grid["xaxis" + suffix].showticklabels = false;
+        }
+    }
+    return grid;
+}
+
+function onRow(trace, row) {
+    return Object.assign({}, trace, {
+        xaxis: "x",
+        yaxis: row === 1 ? "y" : "y" + row,
+    });
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    charts: {
+        merge: function (parts, cache) {
+            var skip = [dash_clientside.no_update, dash_clientside.no_update];
+            if (!parts) {
+                return skip;
+            }
+            if (parts.price) {
+                cache = parts;
+            } else if (cache && JSON.stringify(cache.key) === JSON.stringify(parts.key)) {
+                cache = Object.assign({}, cache, {
+                    studies: Object.assign({}, cache.studies, parts.studies),
+                });
+            } else {
+                // studies of bars the chart no longer shows
+                return skip;
+            }
+            return [cache, {key: cache.key, studies: Object.keys(cache.studies)}];
+        },
+        assemble: function (parts, studies) {
+            if (!parts) {
+                return dash_clientside.no_update;
+            }
+            var shown = (studies || []).filter(function (name) {
+                return name in parts.studies;
+            });
+            var subplots = shown.filter(function (name) {
+                return parts.overlays.indexOf(name) === -1;
+            });
+            var rows = subplots.length + 1;
+            var grid = rows > 1 ? subplotAxes(rows, 0.05) : {xaxis: {}, yaxis: {}};
+
+            var layout = Object.assign({}, parts.layout);
+            Object.keys(grid).forEach(function (name) {
+                var style = name.charAt(0) === "x" ? parts.axes[0] : parts.axes[1];
+                layout[name] = Object.assign({}, layout[name], style, grid[name]);
+                if (name.charAt(0) === "x" && parts.range) {
+                    layout[name].range = parts.range;
+                }
+            });
+
+            var data = [parts.price];
+            shown.forEach(function (name) {
+                if (parts.overlays.indexOf(name) !== -1) {
+                    parts.studies[name].forEach(function (trace) {
+                        data.push(onRow(trace, 1));
+                    });
+                }
+            });
+            subplots.forEach(function (name, i) {
+                parts.studies[name].forEach(function (trace) {
+                    data.push(onRow(trace, i + 2));
+                });
+            });
+            return {data: data, layout: layout};
+        },
+    },
+});
@@ -0,0 +1,68 @@
+// Merges the minute deltas of update__rtchart into the displayed real-time
+// figure, so that only the new minutes cross the network on each tick.
+
+function replaceFrom(trace, x, values) {
+    // points from x[0] on are replaced: the last minute the chart has may
+    // have been revised
+    var keep = 0;
+    while (keep < trace.x.length && trace.x[keep] < x[0]) {
+        keep++;
+    }
+    var updated = Object.assign({}, trace, {x: trace.x.slice(0, keep).concat(x)});
+    Object.keys(values).forEach(function (key) {
+        updated[key] = (trace[key] || []).slice(0, keep).concat(values[key]);
+    });
+    return updated;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    realtime: {
+        apply_delta: function (full, delta, figure) {
+            var triggered = dash_clientside.callback_context.triggered.map(
+                function (t) { return t.prop_id; }
+            );
+            if (triggered.indexOf("rt_figure.data") !== -1 || !figure) {
+                return full || dash_clientside.no_update;
+            }
+            if (!delta || delta.value === undefined) {
+                return dash_clientside.no_update;
+            }
+            var layout = figure.layout;
+            var data = figure.data.map(function (trace, i) {
+                if (trace.type === "indicator") {
+                    return Object.assign({}, trace, {
+                        value: delta.value,
+                        delta: Object.assign({}, trace.delta, {reference: delta.reference}),
+                    });
+                }
+                if (!delta.x) {
+                    return trace;
+                }
+                if (i === 0) {
+                    trace = replaceFrom(trace, delta.x, {
+                        y: delta.y,
+                        customdata: delta.customdata,
+                    });
+                    trace.line = Object.assign({}, trace.line, {color: delta.color});
+                    return trace;
+                }
+                if (delta.overlays && delta.overlays[trace.name]) {
+                    return replaceFrom(trace, delta.x, {y: delta.overlays[trace.name]});
+                }
+                if (trace.type === "bar" && delta.profile) {
+                    layout = Object.assign({}, layout, {
+                        xaxis2: Object.assign({}, layout.xaxis2, {
+                            range: [delta.profile.max * 4, 0],
+                        }),
+                    });
+                    return Object.assign({}, trace, {
+                        x: delta.profile.x,
+                        y: delta.profile.y,
+                    });
+                }
+                return trace;
+            });
+            return Object.assign({}, figure, {data: data, layout: layout});
+        },
+    },
+});
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+import pandas as pd
+import charts
+import indicator_engine as engine
+from history_store import DATA_DIR, auto_resample
+from figures import epoch_ms
+from downsample import thin_prices
+
+
+SIZES = [100, 1000, 10000, 100000, 1000000]
+# figures are built from every point, beyond this they only measure plotly
+FIGURE_MAX_BARS = 100000
+RESULTS_PATH = os.path.join(DATA_DIR, "benchmark.json")
+# microseconds per bar allowed for each case, about five times the timings
+# of a laptop, checked on series of at least BUDGET_MIN_BARS bars where the
+# per-call overhead no longer dominates
+BUDGET_MIN_BARS = 10000
+budgets = {
+    "study:RSI_trace": 0.25,
+    "study:ROC_trace": 0.05,
+    "study:MACD_trace": 0.15,
+    "study:OBV_trace": 0.1,
+    "study:TSI_trace": 0.25,
+    "study:ATR_trace": 0.15,
+    "study:CCI_trace": 0.6,
+    "study:EMA_trace": 0.1,
+    "study:SMA_trace": 0.2,
+    "study:BOLLINGER_trace": 1.0,
+    "studies:all": 3.0,
+    "resample:auto": 4.0,
+    "assembly:studies": 9.0,
+    "assembly:styles": 3.5,
+    "main_chart:ohlc_trace": 15.0,
+    "main_chart:candle_trace": 15.0,
+    "main_chart:line_trace": 15.0,
+}
+
+
+def synthetic_ohlcv(n, seed=0):
+    # deterministic random walk of 1-minute bars ending on a fixed date
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+    opens = np.concatenate(([100.0], close[:-1]))
+    spread = np.abs(rng.normal(0, 5e-4, (2, n)))
+    return pd.DataFrame(
+        {
+            "open": opens,
+            "high": np.maximum(opens, close) * (1 + spread[0]),
+            "low": np.minimum(opens, close) * (1 - spread[1]),
+            "close": close,
+            "volume": rng.integers(1000, 10 ** 7, n).astype(float),
+        },
+        index=pd.date_range(end="2021-12-31 16:00", periods=n, freq="min"),
+    )
+
+
+def chart_data(df):
+    # the frame main_chart hands to the trace builders
+    data = df.copy()
+    data["date"] = epoch_ms(data.index)
+    data.index = np.arange(0, len(data))
+    return data
+
+
+def best_time(fn, repeat):
+    best = None
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(i)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def cases(df):
+    n = len(df)
+    names = list(charts.dic_studies)
+    for name in names:
+        yield "study:" + name, lambda i, name=name: engine.compute_studies(
+            [name], df
+        )
+    yield "studies:all", lambda i: engine.compute_studies(names, df)
+    yield "resample:auto", lambda i: auto_resample(df)
+    if n > FIGURE_MAX_BARS:
+        return
+
+    data = chart_data(df)
+    values = engine.compute_studies(names, data)
+
+    # the traces main_chart sends, downsampled to CHART_POINTS
+    yield "assembly:studies", lambda i: charts.study_traces(data, values)
+    yield "assembly:styles", lambda i: [
+        style(thin_prices(data, name)) for name, style in charts.dic_styles.items()
+    ]
+
+    # main_chart reads its bars through get_history, stubbed with the
+    # synthetic series; a new company per call keeps the study cache cold
+    get_history = charts.get_history
+    charts.get_history = lambda company, duration, interval="1d": df.copy()
+    try:
+        for style in charts.dic_styles:
+            yield "main_chart:" + style, lambda i, style=style: charts.main_chart(
+                "BENCH%d-%d" % (n, i), names, "max", style
+            )
+    finally:
+        charts.get_history = get_history
+
+
+def run(sizes=SIZES):
+    results = []
+    for n in sizes:
+        df = synthetic_ohlcv(n)
+        repeat = 5 if n <= 10000 else 3 if n <= 100000 else 1
+        for case, fn in cases(df):
+            fn(-1)
+            seconds = best_time(fn, repeat)
+            results.append(
+                {
+                    "case": case,
+                    "bars": n,
+                    "seconds": seconds,
+                    "us_per_bar": seconds / n * 1e6,
+                }
+            )
+            print("%-26s %9d bars %10.5f s" % (case, n, seconds))
+    return results
+
+
+def regressions(results, baseline=None, tolerance=1.5):
+    failed = []
+    for result in results:
+        budget = budgets.get(result["case"])
+        if (
+            budget is not None
+            and result["bars"] >= BUDGET_MIN_BARS
+            and result["us_per_bar"] > budget
+        ):
+            failed.append(
+                "%s on %d bars: %.3f us/bar over the %.3f us/bar budget"
+                % (result["case"], result["bars"], result["us_per_bar"], budget)
+            )
+    for result in results if baseline else []:
+        previous = baseline.get((result["case"], result["bars"]))
+        if (
+            previous is not None
+            and result["bars"] >= BUDGET_MIN_BARS
+            and result["seconds"] > previous * tolerance
+        ):
+            failed.append(
+                "%s on %d bars: %.5f s, %.2fx the baseline %.5f s"
+                % (
+                    result["case"],
+                    result["bars"],
+                    result["seconds"],
+                    result["seconds"] / previous,
+                    previous,
+                )
+            )
+    return failed
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return {(r["case"], r["bars"]): r["seconds"] for r in json.load(f)["results"]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the studies, trace builders and main_chart"
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    failed = regressions(results, baseline, args.tolerance)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "machine": platform.machine(),
+                "results": results,
+                "regressions": failed,
+            },
+            f,
+            indent=2,
+        )
+    for message in failed:
+        print("REGRESSION " + message, file=sys.stderr)
+    sys.exit(1 if failed else 0)
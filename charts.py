@@ -1,17 +1,47 @@
-import plotly.graph_objs as go
 from technical_indicators import *
 from utilities import *
-from yahooquery import Ticker
 import numpy as np
 import pandas as pd
-from plotly.subplots import make_subplots
 from pytz import timezone
 from datetime import datetime
-from yahoo_fin import stock_info as si
+from quote_cache import get_quote
+from market_session import get_market_status
+from history_store import (
+    auto_interval,
+    auto_resample,
+    get_history,
+    interval_units,
+    resample_bars,
+)
+from intraday import get_intraday, get_intraday_studies
+from indicator_cache import cached_studies, data_version
+from indicator_engine import resolve_params
+from downsample import (
+    RT_CHART_POINTS,
+    lttb_indices,
+    select,
+    thin_prices,
+    thin_series,
+    visible_rows,
+)
+from figures import (
+    DECIMALS,
+    axes,
+    compact,
+    epoch_ms,
+    figure,
+    indicator,
+    layouts,
+    on_row,
+)
+
+
+PRICES = ["open", "high", "low", "close"]
 
 
 def ohlc_trace(df):
-    return go.Ohlc(
+    return dict(
+        type="ohlc",
         x=df.date,
         open=df["open"],
         high=df["high"],
@@ -19,13 +49,13 @@ def ohlc_trace(df):
         close=df["close"],
         name="OHLC",
         line=dict(width=1),
-        customdata=df.vol,
         hoverinfo="x+y+text",
     )
 
 
 def candle_trace(df):
-    return go.Candlestick(
+    return dict(
+        type="candlestick",
         x=df.date,
         open=df["open"],
         high=df["high"],
@@ -39,16 +69,17 @@ def candle_trace(df):
 
 def line_trace(df):
 
-    return go.Scatter(
+    return dict(
+        type="scatter",
         x=df.date,
         y=df["close"],
         mode="lines",
         name="Prices",
         line=dict(width=1, shape="linear", dash="solid", smoothing=0),
-        customdata=np.stack(
-            (df["open"], df["high"], df["low"], df["close"], df["vol"], df["date"])
-        ).T,
-        hovertemplate="<b>%{customdata[5]|%B %d, %Y}</b><br>Open: %{customdata[0]:.3f} <br>High: %{customdata[1]:.3f} <br>Low: %{customdata[2]:.3f} <br>Close: %{customdata[3]:.3f} <br>Volume: %{customdata[4]} <extra></extra>",
+        customdata=np.column_stack(
+            (df["open"], df["high"], df["low"], df["close"], df["volume"])
+        ),
+        hovertemplate="<b>%{x|%B %d, %Y}</b><br>Open: %{customdata[0]:.3f} <br>High: %{customdata[1]:.3f} <br>Low: %{customdata[2]:.3f} <br>Close: %{customdata[3]:.3f} <br>Volume: %{customdata[4]:.3s} <extra></extra>",
     )
 
 
@@ -71,231 +102,308 @@ dic_styles = {
 }
 
 
-def main_chart(company, list_charts, duration, styles):
+# studies drawn over the prices, the others get a row of their own
+overlay_studies = ["SMA_trace", "EMA_trace", "BOLLINGER_trace"]
+# studies whose name gives their window, counted in bars of the interval
+windowed_studies = [
+    "RSI_trace",
+    "ROC_trace",
+    "MACD_trace",
+    "ATR_trace",
+    "CCI_trace",
+    "EMA_trace",
+    "SMA_trace",
+]
 
-    data = Ticker(company).history(period=duration, interval="1d", adj_timezone=True)
-    data = data.loc[company]
-    data["vol"] = data.volume.apply(human_format)
-    data["date"] = pd.to_datetime(data.index).strftime("%Y-%m-%d")
-    data.index = np.arange(0, len(data))
-
-    appended_studies = ["SMA_trace", "EMA_trace", "BOLLINGER_trace"]
-    tmp_studies = []
-    for idx, i in enumerate(list_charts):
-        if i in appended_studies:
-            tmp_studies.append(i)
 
-    final_charts = [chart for chart in list_charts if chart not in tmp_studies]
+def chart_key(company, duration, x_range=None):
+    # the bars a set of study traces was computed from
+    return [company, duration, x_range]
 
-    fig = make_subplots(
-        rows=len(final_charts) + 1,
-        cols=1,
-        shared_xaxes=True,
-        vertical_spacing=0.05,
-    )
 
-    fig.add_trace(dic_styles[styles](data), row=1, col=1)
+def chart_bars(company, duration, list_charts, x_range=None):
+    # the bars of the main chart, their interval and the values of the
+    # studies in `list_charts`, bars and values rounded for the browser
+    if x_range is None:
+        data, interval = auto_resample(get_history(company, duration))
+    else:
+        # bars as fine as the zoomed span allows, the studies are still
+        # computed over the whole duration
+        data = get_history(company, duration)
+        visible = data.loc[pd.Timestamp(x_range[0]) : pd.Timestamp(x_range[1])]
+        interval = auto_interval(visible)
+        data = resample_bars(data, interval)
+    version = data_version(data)
+    dates = data.index
+    data["date"] = epoch_ms(dates)
+    data.index = np.arange(0, len(data))
 
-    for i in tmp_studies:
+    values = cached_studies(company, duration, data, list_charts, version)
+    if x_range is not None:
+        shown = visible_rows(dates, x_range)
+        data = data[shown]
+        values = {i: select(values[i], shown) for i in list_charts}
+    # after the studies, which are computed from the exact prices
+    data = data.round({column: DECIMALS for column in PRICES})
+    values = {i: compact(values[i]) for i in list_charts}
+    return data, values, interval
+
+
+def study_traces(data, values, interval="1d"):
+    studies = {}
+    for i, value in values.items():
+        series, study = thin_series(data, value)
+        # the parameters the values were computed with name the trace
+        labels = resolve_params(i)
+        if i in windowed_studies:
+            labels["unit"] = interval_units[interval]
         if i == "BOLLINGER_trace":
-            dic_studies[i](data, fig)
+            bands = {"data": []}
+            dic_studies[i](series, bands, values=study, **labels)
+            studies[i] = bands["data"]
         else:
-            fig.add_trace(dic_studies[i](data), row=1, col=1)
-
-    for idx, i in enumerate(final_charts):
-        fig.add_trace(dic_studies[i](data), row=idx + 2, col=1)
-
-    fig.update_layout(
-        xaxis_rangeslider_visible=False,
-        margin={"t": 30, "l": 20, "b": 25, "r": 10},
-        autosize=True,
-        paper_bgcolor="#22252b",
-        plot_bgcolor="#22252b",
-        height=480,
-        hovermode="x",  # x
-        hoverlabel={
-            "align": "auto",
-            "font": {"color": "#ededed", "size": 9},
-        },
-        legend={
-            "font": {"color": "#b2b2b2", "size": 9},
-            "itemsizing": "trace",
-            "orientation": "v",
-        },
-    )
+            studies[i] = [dic_studies[i](series, values=study, **labels)]
+    return studies
+
+
+def main_chart_parts(company, duration, styles, list_charts, x_range=None):
+    # The price trace and the traces of the checked studies, from which
+    # assemble_chart, or assets/charts.js in the browser, builds the figure.
+    # Studies checked later are fetched with main_chart_studies.
+    data, values, interval = chart_bars(company, duration, list_charts, x_range)
+    return {
+        "key": chart_key(company, duration, x_range),
+        "price": on_row(dic_styles[styles](thin_prices(data, styles)), 1),
+        "studies": study_traces(data, values, interval),
+        "overlays": overlay_studies,
+        "range": x_range,
+        # what assets/charts.js needs of figures.figure("main", ...)
+        "layout": layouts["main"],
+        "axes": axes["main"],
+    }
+
+
+def main_chart_studies(company, duration, list_charts, x_range=None):
+    # only the traces of `list_charts`, merged by assets/charts.js into the
+    # parts of the same key it already has
+    data, values, interval = chart_bars(company, duration, list_charts, x_range)
+    return {
+        "key": chart_key(company, duration, x_range),
+        "studies": study_traces(data, values, interval),
+    }
+
+
+def assemble_chart(parts, list_charts):
+    # the same figure as assets/charts.js builds in the browser
+    shown = [i for i in list_charts if i in parts["studies"]]
+    subplots = [i for i in shown if i not in parts["overlays"]]
+    fig = figure("main", [parts["price"]], rows=len(subplots) + 1)
+    traces = fig["data"]
+
+    for i in shown:
+        if i in parts["overlays"]:
+            traces.extend(on_row(dict(trace), 1) for trace in parts["studies"][i])
+
+    for idx, i in enumerate(subplots):
+        traces.extend(on_row(dict(trace), idx + 2) for trace in parts["studies"][i])
+
+    if parts["range"] is not None:
+        for name, axis in fig["layout"].items():
+            if name.startswith("xaxis"):
+                fig["layout"][name] = dict(axis, range=parts["range"])
+    return fig
 
-    fig.update_traces(xaxis="x")
-
-    fig.update_xaxes(
-        gridcolor="#3E3F40",
-        gridwidth=1,
-        zeroline=False,
-        tickfont={
-            "color": "#b2b2b2",
-            "size": 8,
-        },
-        showspikes=True,
-        spikecolor="#6c757d",
-        spikemode="across+marker",
-        spikesnap="hovered data",
-        spikethickness=1,
-        spikedash="dot",
-    )
 
-    fig.update_yaxes(
-        showgrid=True,
-        gridcolor="#3E3F40",
-        gridwidth=1,
-        zeroline=False,
-        tickfont={
-            "color": "#b2b2b2",
-            "size": 8,
-        },
-        showspikes=True,
-        spikecolor="#6c757d",
-        spikemode="across+marker",
-        spikesnap="hovered data",
-        spikethickness=1,
-        spikedash="dot",
-    )
-    return fig
+def main_chart(company, list_charts, duration, styles, x_range=None):
+    parts = main_chart_parts(company, duration, styles, list_charts, x_range)
+    return assemble_chart(parts, list_charts)
 
 
-def rt_chart(company):
+# lines of intraday_studies drawn over the real-time chart
+intraday_lines = [
+    ("vwap", "VWAP", "dot", "#d3a54a"),
+    ("anchored_vwap", "Anchored VWAP", "dash", "#d3a54a"),
+    ("EMA_trace", "EMA(12)", "solid", "#5b8fd0"),
+]
+# traces of a real-time figure that deltas update in place
+intraday_traces = [label for name, label, dash, color in intraday_lines] + [
+    "Volume Profile"
+]
+
+
+def rt_traces(fig):
+    return [
+        trace["name"] for trace in fig["data"] if trace.get("name") in intraday_traces
+    ]
+
+
+def intraday_overlays(fig, studies, data, times):
+    for name, label, dash, color in intraday_lines:
+        serie = studies[name]
+        if serie.empty:
+            continue
+        fig["data"].append(
+            dict(
+                type="scatter",
+                x=data.date,
+                y=compact(serie.reindex(times, method="ffill")),
+                mode="lines",
+                name=label,
+                showlegend=False,
+                line=dict(width=1, color=color, dash=dash),
+                hovertemplate=label + ": %{y:.3f}<extra></extra>",
+            )
+        )
+
+    profile = studies["profile"]
+    if not profile.empty:
+        fig["data"].append(
+            dict(
+                type="bar",
+                x=profile.values,
+                y=profile.index,
+                orientation="h",
+                xaxis="x2",
+                name="Volume Profile",
+                showlegend=False,
+                marker=dict(color="#6c757d", opacity=0.35),
+                hovertemplate="%{y:.2f}: %{x:.3s}<extra>Volume</extra>",
+            )
+        )
+        # bars grow from the right edge over a quarter of the plot
+        fig["layout"]["xaxis2"] = dict(
+            overlaying="x",
+            range=[profile.max() * 4, 0],
+            visible=False,
+        )
+        fig["layout"]["bargap"] = 0
 
-    data = Ticker(company).history(period="1d", interval="1m", adj_timezone=False)
-    if len(data) > 3:
-        data = data.loc[company].asfreq("60s", method="ffill")
-    else:
-        data = data.loc[company]
-    data["date"] = pd.to_datetime(data.index).strftime("%Y-%m-%d %H:%M:%S")
-    data.index = np.arange(0, len(data))
 
-    prev_close = Ticker(company).quotes[company]["regularMarketPreviousClose"]
-    rt_close = si.get_live_price(company)
+def rt_quote(company, data):
+    quote = get_quote(company)
+    prev_close = quote["regularMarketPreviousClose"]
+    rt_close = quote.get("regularMarketPrice", data["close"].iloc[-1])
     change = rt_close - prev_close
     if change > 0:
         line_color = "green"
     else:
         line_color = "red"
+    return rt_close, prev_close, line_color
+
+
+def rt_chart(company):
+
+    data = get_intraday(company)
+    studies = get_intraday_studies(company)
+    if len(data) > 3:
+        data = data.asfreq("60s", method="ffill")
+    data = data.iloc[lttb_indices(data["close"].to_numpy(), RT_CHART_POINTS)]
+    times = data.index
+    data["date"] = epoch_ms(times)
+    data.index = np.arange(0, len(data))
+
+    rt_close, prev_close, line_color = rt_quote(company, data)
 
     dt = datetime.now(timezone("America/New_York"))
     dt = dt.replace(tzinfo=None)
     dt = dt.replace(hour=20, minute=1)
     r_time = datetime.strptime(dt.strftime("%Y-%m-%d %H:%M:%S"), "%Y-%m-%d %H:%M:%S")
-    intrv = r_time - datetime.strptime(data.date.iloc[0], "%Y-%m-%d %H:%M:%S")
+    intrv = r_time - times[0].to_pydatetime()
     if intrv.days >= 1:
         intrv = data.date.iloc[-1]
     else:
-        intrv = dt
-    fig = go.Figure(
-        data=[
-            go.Scatter(
+        intrv = epoch_ms([dt])[0]
+    fig = figure(
+        "realtime",
+        [
+            dict(
+                type="scatter",
                 x=data.date,
                 y=data["close"],
                 mode="lines",
                 name="Line",
-                customdata=np.stack(
-                    (
-                        data["open"],
-                        data["high"],
-                        data["low"],
-                        data["close"],
-                        data["volume"],
-                    )
-                ).T,
+                customdata=compact(data[PRICES + ["volume"]].to_numpy()),
                 line=dict(
                     width=1, color=line_color, shape="linear", dash="solid", smoothing=0
                 ),
-                hovertemplate="<b>%{x|%m/%d %H:%M}</b><br>Open: %{customdata[0]:.3f} <br>High: %{customdata[1]:.3f} <br>Low: %{customdata[2]:.3f} <br>Close: %{customdata[3]:.3f} <br>Volume: %{customdata[4]}<extra></extra>",
-            )
-        ]
+                hovertemplate="<b>%{x|%m/%d %H:%M}</b><br>Open: %{customdata[0]:.3f} <br>High: %{customdata[1]:.3f} <br>Low: %{customdata[2]:.3f} <br>Close: %{customdata[3]:.3f} <br>Volume: %{customdata[4]:.3s}<extra></extra>",
+            ),
+            indicator("realtime", rt_close, prev_close),
+        ],
+        xaxis={"range": [data.date.iloc[0], intrv]},
     )
 
-    fig.add_trace(
-        go.Indicator(
-            mode="number+delta",
-            value=rt_close,
-            delta={
-                "reference": prev_close,
-                "valueformat": ".2f",
-                "position": "bottom",
-                "font": {
-                    "color": "#b2b2b2",
-                    "size": 25,
-                    "family": "Trebuchet MS, sans-serif",
-                },
-            },
-            title={
-                "text": "Close Price",
-                "align": "center",
-                "font": {
-                    "color": "#797979",
-                    "size": 20,
-                    "family": "Trebuchet MS, sans-serif",
-                },
-            },
-            align="center",
-            number={
-                "valueformat": ".2f",
-                "font": {
-                    "color": "#797979",
-                    "size": 40,
-                    "family": "Trebuchet MS, sans-serif",
-                },
-            },
-        )
-    )
+    if studies is not None:
+        intraday_overlays(fig, studies, data, times)
 
-    fig.update_layout(
-        margin={"t": 30, "l": 30, "b": 30, "r": 20},
-        autosize=True,
-        paper_bgcolor="#22252b",
-        plot_bgcolor="#22252b",
-        hoverlabel={
-            "align": "auto",
-            "font": {"color": "#ededed", "size": 8},
-        },
-    )
-    fig.update_xaxes(
-        range=[data.date.iloc[0], intrv],
-        gridcolor="#3E3F40",
-        gridwidth=1,
-        tickfont={
-            "color": "#b2b2b2",
-            "size": 8,
-        },
-        showspikes=True,
-        spikecolor="#6c757d",
-        spikemode="across+marker",
-        spikesnap="hovered data",
-        spikethickness=1,
-        spikedash="dot",
-    )
+    return fig
 
-    fig.update_yaxes(
-        showgrid=True,
-        gridcolor="#3E3F40",
-        gridwidth=1,
-        tickfont={
-            "color": "#b2b2b2",
-            "size": 8,
-        },
-        showspikes=True,
-        spikecolor="#6c757d",
-        spikemode="across+marker",
-        spikesnap="hovered data",
-        spikethickness=1,
-        spikedash="dot",
+
+def rt_delta_fits(data, since):
+    # a delta only extends the session the browser shows: after a new session
+    # started, or once the ring no longer holds `since`, the full figure is
+    # sent instead
+    if data is None or not len(data) or since is None:
+        return False
+    since = pd.Timestamp(since, unit="ms")
+    return since.date() == data.index[-1].date() and since >= data.index[0]
+
+
+def rt_delta(company, since, traces=()):
+    # the minutes from `since` (the last one the browser has, which may have
+    # been revised) on, with the new indicator value, for
+    # assets/realtime.js to merge into the displayed figure. `traces` are the
+    # rt_traces the browser has; a delta whose own differ cannot be merged
+    data = get_intraday(company)
+    rt_close, prev_close, line_color = rt_quote(company, data)
+    delta = {
+        "company": company,
+        "last": since,
+        "traces": list(traces),
+        "value": rt_close,
+        "reference": prev_close,
+        "color": line_color,
+    }
+    data = data.loc[pd.Timestamp(since, unit="ms") :]
+    if len(data) > 1:
+        data = data.asfreq("60s", method="ffill")
+    if not len(data):
+        return delta
+    times = data.index
+    dates = epoch_ms(times).tolist()
+    values = data[PRICES + ["volume"]].round(DECIMALS)
+    delta.update(
+        last=dates[-1],
+        x=dates,
+        y=values["close"].tolist(),
+        customdata=values.to_numpy().tolist(),
     )
 
-    return fig
+    studies = get_intraday_studies(company)
+    if studies is not None:
+        delta["overlays"] = {
+            label: studies[name].reindex(times, method="ffill").round(DECIMALS).tolist()
+            for name, label, dash, color in intraday_lines
+            if not studies[name].empty
+        }
+        # the whole profile, a revised minute can move its volume to another
+        # bin and the profile is a few hundred bins at most
+        profile = studies["profile"]
+        if not profile.empty:
+            delta["profile"] = {
+                "x": profile.tolist(),
+                "y": profile.index.tolist(),
+                "max": float(profile.max()),
+            }
+        delta["traces"] = list(delta["overlays"]) + ["Volume Profile"] * (
+            not profile.empty
+        )
+    return delta
 
 
 def model_chart(company, hist):
-    status = si.get_market_status()
-    data = Ticker(company).history(period="ytd", interval="1d", adj_timezone=False)
-    data = data.loc[company]
+    status = get_market_status()
+    data = get_history(company, "ytd")
     if status == "REGULAR":
         data = data.iloc[len(data) - len(hist) + 1 : -1]
     else:
@@ -303,9 +411,14 @@ def model_chart(company, hist):
     data["date"] = pd.to_datetime(data.index).strftime("%Y-%m-%d %H:%M:%S")
     data.index = np.arange(0, len(data))
 
-    fig = go.Figure(
-        data=[
-            go.Scatter(
+    confidence_line = dict(
+        width=1, shape="spline", dash="longdash", smoothing=0.5, color="gray"
+    )
+    return figure(
+        "model",
+        [
+            dict(
+                type="scatter",
                 x=data.date,
                 y=data.close,
                 mode="lines+markers",
@@ -313,155 +426,47 @@ def model_chart(company, hist):
                 hovertemplate="MP: %{y:.4f}",
                 line=dict(width=1, shape="linear", dash="solid", smoothing=0),
             ),
-        ]
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=hist.index,
-            y=hist.f_price,
-            mode="lines+markers",
-            name="FP",
-            hovertemplate="MP: %{y:.4f}",
-            line=dict(width=1, shape="linear", dash="solid", smoothing=0),
-        )
-    )
-
-    fig.add_trace(
-        go.Scatter(
-            x=hist.index,
-            y=hist.min_conf,
-            mode="lines",
-            marker=dict(color="#444"),
-            line=dict(
-                width=1, shape="spline", dash="longdash", smoothing=0.5, color="gray"
+            dict(
+                type="scatter",
+                x=hist.index,
+                y=hist.f_price,
+                mode="lines+markers",
+                name="FP",
+                hovertemplate="MP: %{y:.4f}",
+                line=dict(width=1, shape="linear", dash="solid", smoothing=0),
             ),
-            showlegend=False,
-            hovertemplate="Min Confidence: %{y:.4f}<extra></extra>",
-        )
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=hist.index,
-            y=hist.max_conf,
-            marker=dict(color="#444"),
-            line=dict(
-                width=1, shape="spline", dash="longdash", smoothing=0.5, color="gray"
+            dict(
+                type="scatter",
+                x=hist.index,
+                y=hist.min_conf,
+                mode="lines",
+                marker=dict(color="#444"),
+                line=confidence_line,
+                showlegend=False,
+                hovertemplate="Min Confidence: %{y:.4f}<extra></extra>",
             ),
-            mode="lines",
-            fill="tonexty",
-            showlegend=False,
-            hovertemplate="Max Confidence: %{y:.4f}<extra></extra>",
-        )
-    )
-
-    fig.update_layout(
-        width=500,
-        height=300,
-        margin={"t": 10, "l": 10, "b": 10, "r": 10},
-        autosize=True,
-        paper_bgcolor="#1d1e22",
-        plot_bgcolor="#1d1e22",
-        hovermode="x",
-        hoverlabel={
-            "align": "auto",
-            "font": {"color": "#ededed", "size": 8},
-        },
-        legend={
-            "font": {"color": "#b2b2b2", "size": 8},
-            "itemsizing": "trace",
-            "orientation": "v",
-        },
-    )
-
-    fig.update_traces(xaxis="x")
-
-    fig.update_xaxes(
-        gridcolor="#3E3F40",
-        gridwidth=1,
-        zerolinecolor="#3E3F40",
-        zerolinewidth=1,
-        tickfont={
-            "color": "#b2b2b2",
-            "size": 8,
-        },
-        showspikes=True,
-        spikecolor="#6c757d",
-        spikemode="across+marker",
-        spikesnap="hovered data",
-        spikethickness=1,
-        spikedash="dot",
-    )
-
-    fig.update_yaxes(
-        showgrid=True,
-        gridcolor="#3E3F40",
-        gridwidth=1,
-        zerolinecolor="#3E3F40",
-        zerolinewidth=1.5,
-        tickfont={
-            "color": "#b2b2b2",
-            "size": 8,
-        },
-        showspikes=True,
-        spikecolor="#6c757d",
-        spikemode="across+marker",
-        spikesnap="hovered data",
-        spikethickness=1,
-        spikedash="dot",
+            dict(
+                type="scatter",
+                x=hist.index,
+                y=hist.max_conf,
+                marker=dict(color="#444"),
+                line=confidence_line,
+                mode="lines",
+                fill="tonexty",
+                showlegend=False,
+                hovertemplate="Max Confidence: %{y:.4f}<extra></extra>",
+            ),
+        ],
     )
 
-    return fig
-
 
 def indc_price(price, company):
-    status = si.get_market_status()
-    data = Ticker(company).history(period="1d", interval="1d", adj_timezone=False)
-    data = data.loc[company]
-    dd = datetime.strptime(str(data.index[-1]), "%Y-%m-%d")
+    status = get_market_status()
+    data = get_history(company, "1d")
+    dd = datetime.strptime(data.index[-1].strftime("%Y-%m-%d"), "%Y-%m-%d")
     td = datetime.strptime(datetime.today().strftime("%Y-%m-%d"), "%Y-%m-%d")
     if td > dd:
-        prev = Ticker("AAPL").quotes["AAPL"]["regularMarketPreviousClose"]
+        prev = get_quote("AAPL")["regularMarketPreviousClose"]
     else:
         prev = data.iloc[-1].close
-    fig = go.Figure(
-        data=[
-            go.Indicator(
-                mode="number+delta",
-                value=price,
-                delta={
-                    "reference": prev,
-                    "valueformat": ".2f",
-                    "position": "bottom",
-                    "font": {
-                        "color": "#b2b2b2",
-                        "size": 15,
-                        "family": "Trebuchet MS, sans-serif",
-                    },
-                },
-                align="center",
-                number={
-                    "valueformat": ".3f",
-                    "font": {
-                        "color": "#797979",
-                        "size": 30,
-                        "family": "Trebuchet MS, sans-serif",
-                    },
-                },
-            )
-        ]
-    )
-
-    fig.update_layout(
-        width=120,
-        height=80,
-        margin={"t": 30, "l": 30, "b": 30, "r": 20},
-        autosize=True,
-        paper_bgcolor="#1d1e22",
-        plot_bgcolor="#1d1e22",
-        hoverlabel={
-            "align": "auto",
-            "font": {"color": "#ededed", "size": 8},
-        },
-    )
-
-    return fig
+    return figure("price_indicator", [indicator("price_indicator", price, prev)])
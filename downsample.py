@@ -0,0 +1,150 @@
+import os
+import numpy as np
+import pandas as pd
+
+
+# most points a trace sends to the browser, about what a chart can show
+CHART_POINTS = int(os.environ.get("CHART_POINTS", 1000))
+RT_CHART_POINTS = int(os.environ.get("RT_CHART_POINTS", 400))
+# points per bucket above which LTTB buckets are solved one at a time
+LTTB_WIDE_BUCKET = 200
+
+
+def lttb_indices(y, threshold, x=None):
+    # Largest-Triangle-Three-Buckets: keeps the first and last points and,
+    # in each of threshold - 2 buckets, the point forming the largest
+    # triangle with the point kept before it and the mean of the next bucket
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    if (n - 2) / (threshold - 2) > LTTB_WIDE_BUCKET:
+        kept[1:-1] = lttb_loop(x, y, edges)
+    else:
+        kept[1:-1] = lttb_passes(x, y, edges)
+    return kept
+
+
+def lttb_loop(x, y, edges):
+    # one bucket after the other, for buckets wide enough that numpy's
+    # per-call overhead does not matter
+    n = len(y)
+    chosen = np.empty(len(edges) - 1, dtype=int)
+    a = 0
+    for i in range(len(chosen)):
+        start, stop = edges[i], edges[i + 1]
+        following = slice(stop, edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[following].mean(), y[following].mean()
+        area = np.abs(
+            (x[a] - cx) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (cy - y[a])
+        )
+        a = start + int(np.argmax(area))
+        chosen[i] = a
+    return chosen
+
+
+def lttb_passes(x, y, edges):
+    # Every bucket solved at once from the points chosen by the previous
+    # pass, then again only the buckets whose previous point changed. This
+    # ends on the points lttb_loop chooses.
+    n = len(y)
+    starts, stops = edges[:-1], edges[1:]
+    following = np.append(edges[2:], n)
+    sums_x = np.concatenate(([0.0], np.cumsum(x)))
+    sums_y = np.concatenate(([0.0], np.cumsum(y)))
+    cx = (sums_x[following] - sums_x[stops]) / (following - stops)
+    cy = (sums_y[following] - sums_y[stops]) / (following - stops)
+    # buckets padded to the widest with their first point, which argmax
+    # prefers on ties
+    cols = starts[:, None] + np.arange((stops - starts).max())
+    cols = np.where(cols < stops[:, None], cols, starts[:, None])
+    bx, by = x[cols], y[cols]
+
+    buckets = len(starts)
+    chosen = np.empty(buckets, dtype=int)
+    anchors = np.concatenate(([0], starts[:-1]))
+    rows = np.arange(buckets)
+    while len(rows):
+        ax = x[anchors[rows]][:, None]
+        ay = y[anchors[rows]][:, None]
+        area = np.abs(
+            (ax - cx[rows, None]) * (by[rows] - ay)
+            - (ax - bx[rows]) * (cy[rows, None] - ay)
+        )
+        chosen[rows] = cols[rows, np.argmax(area, axis=1)]
+        # buckets whose previous point was not the one they were solved with
+        rows = rows[rows + 1 < buckets] + 1
+        rows = rows[anchors[rows] != chosen[rows - 1]]
+        anchors[rows] = chosen[rows - 1]
+    return chosen
+
+
+def bucket_ohlc(df, threshold):
+    # consecutive bars merged into at most `threshold` bars: first open,
+    # highest high, lowest low, last close, summed volume, first row's
+    # other columns (the date)
+    n = len(df)
+    if threshold >= n:
+        return df
+    groups = np.arange(n) * threshold // n
+    grouped = df.groupby(groups)
+    merged = grouped.first()
+    merged["high"] = grouped["high"].max()
+    merged["low"] = grouped["low"].min()
+    merged["close"] = grouped["close"].last()
+    merged["volume"] = grouped["volume"].sum()
+    return merged
+
+
+def select(values, rows):
+    if isinstance(values, tuple):
+        return tuple(np.asarray(v)[rows] for v in values)
+    return np.asarray(values)[rows]
+
+
+def thin_series(data, values, threshold=CHART_POINTS):
+    # rows of `data` and `values` kept to draw the line of `values` (the
+    # middle band of a Bollinger tuple) with at most `threshold` points
+    line = values[-1] if isinstance(values, tuple) else values
+    idx = lttb_indices(line, threshold)
+    if len(idx) == len(line):
+        return data, values
+    return data.iloc[idx], select(values, idx)
+
+
+def thin_prices(data, style, threshold=CHART_POINTS):
+    if len(data) <= threshold:
+        return data
+    if style == "line_trace":
+        return data.iloc[lttb_indices(data["close"].to_numpy(), threshold)]
+    return bucket_ohlc(data, threshold)
+
+
+def zoom_range(relayout):
+    # [start, end] of the x axis from a graph's relayoutData, None when the
+    # axis went back to its full range
+    if not relayout:
+        return False
+    for key, value in relayout.items():
+        if key.startswith("xaxis") and key.endswith(".autorange"):
+            return None
+        if key.startswith("xaxis") and key.endswith(".range"):
+            return [str(value[0]), str(value[1])]
+        if key.startswith("xaxis") and key.endswith(".range[0]"):
+            end = relayout.get(key[:-3] + "[1]")
+            if end is not None:
+                return [str(value), str(end)]
+    return False
+
+
+def visible_rows(dates, x_range, margin=0.5):
+    # mask of the rows in x_range widened by `margin` of its span on both
+    # sides, so small pans do not leave the chart empty
+    start, end = pd.Timestamp(x_range[0]), pd.Timestamp(x_range[1])
+    span = (end - start) * margin
+    dates = pd.DatetimeIndex(dates)
+    return (dates >= start - span) & (dates <= end + span)
@@ -0,0 +1,249 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+import plotly.io as pio
+
+
+# The constant parts of every dashboard figure (theme, axes, spikes,
+# indicator fonts) are validated by plotly once, here, and kept as plain
+# dicts. Callbacks assemble figures as {"data": [...], "layout": {...}} from
+# them without going through go.Figure and its per-property validation.
+#
+# Trace data is sent as plain numbers: dates as epoch milliseconds on axes of
+# type "date", prices and studies rounded to the precision the hovertemplates
+# show. Dates and volumes are formatted by plotly.js, not per row in Python.
+
+# decimals kept for prices and studies, hovertemplates show at most 4
+DECIMALS = 4
+
+font_family = "Trebuchet MS, sans-serif"
+tickfont = {"color": "#b2b2b2", "size": 8}
+spikes = dict(
+    showspikes=True,
+    spikecolor="#6c757d",
+    spikemode="across+marker",
+    spikesnap="hovered data",
+    spikethickness=1,
+    spikedash="dot",
+)
+
+
+def validated_layout(**layout):
+    layout.setdefault("template", pio.templates[pio.templates.default])
+    return go.Layout(**layout).to_plotly_json()
+
+
+def validated_axis(axis, **props):
+    return axis(**props).to_plotly_json()
+
+
+layouts = {
+    "main": validated_layout(
+        xaxis_rangeslider_visible=False,
+        margin={"t": 30, "l": 20, "b": 25, "r": 10},
+        autosize=True,
+        paper_bgcolor="#22252b",
+        plot_bgcolor="#22252b",
+        height=480,
+        hovermode="x",
+        hoverlabel={"align": "auto", "font": {"color": "#ededed", "size": 9}},
+        legend={
+            "font": {"color": "#b2b2b2", "size": 9},
+            "itemsizing": "trace",
+            "orientation": "v",
+        },
+    ),
+    "realtime": validated_layout(
+        margin={"t": 30, "l": 30, "b": 30, "r": 20},
+        autosize=True,
+        paper_bgcolor="#22252b",
+        plot_bgcolor="#22252b",
+        hoverlabel={"align": "auto", "font": {"color": "#ededed", "size": 8}},
+    ),
+    "model": validated_layout(
+        width=500,
+        height=300,
+        margin={"t": 10, "l": 10, "b": 10, "r": 10},
+        autosize=True,
+        paper_bgcolor="#1d1e22",
+        plot_bgcolor="#1d1e22",
+        hovermode="x",
+        hoverlabel={"align": "auto", "font": {"color": "#ededed", "size": 8}},
+        legend={
+            "font": {"color": "#b2b2b2", "size": 8},
+            "itemsizing": "trace",
+            "orientation": "v",
+        },
+    ),
+    "price_indicator": validated_layout(
+        width=120,
+        height=80,
+        margin={"t": 30, "l": 30, "b": 30, "r": 20},
+        autosize=True,
+        paper_bgcolor="#1d1e22",
+        plot_bgcolor="#1d1e22",
+        hoverlabel={"align": "auto", "font": {"color": "#ededed", "size": 8}},
+    ),
+    "pre_post": validated_layout(
+        width=100,
+        height=60,
+        margin={"t": 10, "l": 10, "b": 10, "r": 10},
+        autosize=True,
+        paper_bgcolor="#22252b",
+        plot_bgcolor="#22252b",
+        hoverlabel={"align": "auto", "font": {"color": "#ededed", "size": 8}},
+    ),
+    "placeholder": validated_layout(),
+}
+
+# x and y axis styles of each layout
+axes = {
+    "main": (
+        validated_axis(
+            go.layout.XAxis,
+            type="date",
+            gridcolor="#3E3F40",
+            gridwidth=1,
+            zeroline=False,
+            tickfont=tickfont,
+            **spikes,
+        ),
+        validated_axis(
+            go.layout.YAxis,
+            showgrid=True,
+            gridcolor="#3E3F40",
+            gridwidth=1,
+            zeroline=False,
+            tickfont=tickfont,
+            **spikes,
+        ),
+    ),
+    "realtime": (
+        validated_axis(
+            go.layout.XAxis,
+            type="date",
+            gridcolor="#3E3F40",
+            gridwidth=1,
+            tickfont=tickfont,
+            **spikes,
+        ),
+        validated_axis(
+            go.layout.YAxis,
+            showgrid=True,
+            gridcolor="#3E3F40",
+            gridwidth=1,
+            tickfont=tickfont,
+            **spikes,
+        ),
+    ),
+    "model": (
+        validated_axis(
+            go.layout.XAxis,
+            gridcolor="#3E3F40",
+            gridwidth=1,
+            zerolinecolor="#3E3F40",
+            zerolinewidth=1,
+            tickfont=tickfont,
+            **spikes,
+        ),
+        validated_axis(
+            go.layout.YAxis,
+            showgrid=True,
+            gridcolor="#3E3F40",
+            gridwidth=1,
+            zerolinecolor="#3E3F40",
+            zerolinewidth=1.5,
+            tickfont=tickfont,
+            **spikes,
+        ),
+    ),
+    "placeholder": ({"visible": False}, {"visible": False}),
+}
+
+
+def epoch_ms(times):
+    # naive timestamps as milliseconds since the epoch, read by plotly.js as
+    # the same wall clock times
+    return np.asarray(pd.DatetimeIndex(times), "datetime64[ms]").astype(np.int64)
+
+
+def compact(values, decimals=DECIMALS):
+    if isinstance(values, tuple):
+        return tuple(compact(v, decimals) for v in values)
+    return np.round(np.asarray(values, dtype=float), decimals)
+
+
+def indicator_style(number_color, number_size, delta_size, valueformat, title=None):
+    props = dict(
+        mode="number+delta",
+        delta={
+            "valueformat": ".2f",
+            "position": "bottom",
+            "font": {"color": "#b2b2b2", "size": delta_size, "family": font_family},
+        },
+        align="center",
+        number={
+            "valueformat": valueformat,
+            "font": {"color": number_color, "size": number_size, "family": font_family},
+        },
+    )
+    if title is not None:
+        props["title"] = {
+            "text": title,
+            "align": "center",
+            "font": {"color": "#797979", "size": 20, "family": font_family},
+        }
+    return go.Indicator(**props).to_plotly_json()
+
+
+indicators = {
+    "realtime": indicator_style("#797979", 40, 25, ".2f", "Close Price"),
+    "price_indicator": indicator_style("#797979", 30, 15, ".3f"),
+    "pre_post": indicator_style("#acacad", 25, 15, ".3f"),
+}
+
+
+def subplot_axes(rows, spacing=0.05):
+    # the stacked rows of make_subplots(rows, 1, shared_xaxes=True)
+    height = (1 - spacing * (rows - 1)) / rows
+    grid = {}
+    for row in range(1, rows + 1):
+        suffix = "" if row == 1 else str(row)
+        top = 1 - (row - 1) * (height + spacing)
+        grid["xaxis" + suffix] = {"anchor": "y" + suffix, "domain": [0.0, 1.0]}
+        grid["yaxis" + suffix] = {
+            "anchor": "x" + suffix,
+            "domain": [max(top - height, 0.0), top],
+        }
+        if row < rows:
+            grid["xaxis" + suffix].update(matches="x%d" % rows, showticklabels=False)
+    return grid
+
+
+def figure(kind, data, rows=1, **layout):
+    # `layout` entries replace the template's, dicts are merged one level deep
+    fig_layout = dict(layouts[kind])
+    if kind in axes:
+        xstyle, ystyle = axes[kind]
+        grid = subplot_axes(rows) if rows > 1 else {"xaxis": {}, "yaxis": {}}
+        for name, position in grid.items():
+            style = xstyle if name.startswith("x") else ystyle
+            fig_layout[name] = {**fig_layout.get(name, {}), **style, **position}
+    for key, value in layout.items():
+        if isinstance(value, dict) and isinstance(fig_layout.get(key), dict):
+            value = {**fig_layout[key], **value}
+        fig_layout[key] = value
+    return {"data": data, "layout": fig_layout}
+
+
+def indicator(kind, value, reference, **props):
+    trace = dict(indicators[kind], value=value, **props)
+    trace["delta"] = dict(trace["delta"], reference=reference)
+    return trace
+
+
+def on_row(trace, row):
+    # subplot traces share the x axis of the first row, as in main_chart
+    trace["xaxis"] = "x"
+    trace["yaxis"] = "y" if row == 1 else "y%d" % row
+    return trace
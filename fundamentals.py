@@ -0,0 +1,136 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from history_store import DATA_DIR
+from market_session import NEW_YORK, is_trading_day, next_trading_day
+
+
+DB_PATH = os.path.join(DATA_DIR, "fundamentals.sqlite")
+# fundamentals are considered renewed at this New York time on trading days
+REFRESH_AT = (6, 0)
+# trading days each field stays valid
+field_days = {
+    "ratios": 1,
+    "esg": 1,
+    "rating": 1,
+}
+
+
+def refresh_time(d):
+    return NEW_YORK.localize(datetime(d.year, d.month, d.day, *REFRESH_AT))
+
+
+def expires_at(now, days=1):
+    # the `days`-th trading day refresh time after `now`
+    now = now.astimezone(NEW_YORK)
+    d = now.date()
+    if not is_trading_day(d) or now >= refresh_time(d):
+        d = next_trading_day(d)
+    for _ in range(days - 1):
+        d = next_trading_day(d)
+    return refresh_time(d).timestamp()
+
+
+class FundamentalsCache:
+    # sqlite keeps the values across restarts and shares them between the
+    # gunicorn workers; a value is refetched once its trading-day expiry is
+    # reached, and served stale if that refetch fails. A value rejected by the
+    # field's `valid` check, such as the error string yahooquery returns for a
+    # symbol without data, is never stored.
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stale_hits": 0}
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fundamentals ("
+                "ticker TEXT, field TEXT, value TEXT, fetched REAL, expires REAL, "
+                "PRIMARY KEY (ticker, field))"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def read(self, ticker, field):
+        row = (
+            self._connect()
+            .execute(
+                "SELECT value, expires FROM fundamentals WHERE ticker=? AND field=?",
+                (ticker, field),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def write(self, ticker, field, value, now=None):
+        now = time.time() if now is None else now
+        expires = expires_at(
+            datetime.fromtimestamp(now, NEW_YORK), field_days.get(field, 1)
+        )
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO fundamentals VALUES (?, ?, ?, ?, ?)",
+            (ticker, field, json.dumps(value, default=str), now, expires),
+        )
+        conn.commit()
+
+    def get(self, ticker, field, fetch, valid=None):
+        stored = self.read(ticker, field)
+        if stored is not None and stored[1] > time.time():
+            self._count("hits")
+            return stored[0]
+        try:
+            value = fetch(ticker)
+        except Exception:
+            if stored is None:
+                raise
+            self._count("stale_hits")
+            return stored[0]
+        if valid is not None and not valid(value):
+            if stored is None:
+                self._count("misses")
+                return value
+            self._count("stale_hits")
+            return stored[0]
+        self._count("misses")
+        self.write(ticker, field, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+
+fundamentals_cache = FundamentalsCache()
+
+
+def cached_fundamental(field, valid=None):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(company):
+            return fundamentals_cache.get(company, field, fn, valid)
+
+        return wrapper
+
+    return decorator
+
+
+def fundamentals_stats():
+    return fundamentals_cache.stats()
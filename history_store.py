@@ -0,0 +1,229 @@
+import os
+import threading
+import time
+from datetime import datetime, time as clock_time
+import numpy as np
+import pandas as pd
+from yahooquery import Ticker
+from singleflight import coalesced
+from market_session import (
+    NEW_YORK,
+    get_market_status,
+    is_trading_day,
+    previous_trading_day,
+    session_times,
+)
+
+
+DATA_DIR = os.environ.get("EULERA_DATA_DIR", "data")
+HISTORY_DIR = os.path.join(DATA_DIR, "history")
+HISTORY_REFRESH = 60
+COLUMNS = ["open", "high", "low", "close", "volume"]
+PRICES = ["open", "high", "low", "close"]
+# "auto" intervals pick the finest bar size giving at most this many bars
+MAX_CHART_BARS = int(os.environ.get("MAX_CHART_BARS", 400))
+
+windows = {
+    "5d": pd.DateOffset(days=5),
+    "7d": pd.DateOffset(days=7),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+}
+
+
+periods = {"1wk": "W-FRI", "1mo": "M"}
+aggregations = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+
+@coalesced
+def fetch_history(company, **kwargs):
+    return Ticker(company).history(interval="1d", adj_timezone=True, **kwargs)
+
+
+def normalize_bars(raw, company):
+    if not isinstance(raw, pd.DataFrame) or raw.empty:
+        return None
+    if isinstance(raw.index, pd.MultiIndex):
+        if company not in raw.index.get_level_values(0):
+            return None
+        raw = raw.loc[company]
+    bars = raw[COLUMNS].astype(float)
+    bars.index = pd.to_datetime(
+        [pd.Timestamp(i).strftime("%Y-%m-%d") for i in raw.index]
+    )
+    bars.index.name = "date"
+    bars = bars[~bars.index.duplicated(keep="last")]
+    return bars.sort_index()
+
+
+# unit of the study windows at each interval
+interval_units = {"1d": "days", "1wk": "weeks", "1mo": "months"}
+
+
+def resample_bars(bars, interval):
+    # weekly ("1wk") or monthly ("1mo") bars from daily ones, each labelled
+    # with the date of its first session
+    if interval not in periods or bars is None or not len(bars):
+        return bars
+    groups = bars.index.to_period(periods[interval])
+    resampled = bars.groupby(groups).agg(aggregations)[COLUMNS]
+    resampled.index = pd.DatetimeIndex(
+        bars.index.to_series().groupby(groups).first().to_numpy(), name="date"
+    )
+    return resampled
+
+
+def auto_resample(bars, max_bars=MAX_CHART_BARS):
+    # the finest of daily, weekly or monthly bars that fit in max_bars, and
+    # its interval
+    if bars is None or len(bars) <= max_bars:
+        return bars, "1d"
+    weekly = resample_bars(bars, "1wk")
+    if len(weekly) <= max_bars:
+        return weekly, "1wk"
+    return resample_bars(bars, "1mo"), "1mo"
+
+
+def auto_interval(bars, max_bars=MAX_CHART_BARS):
+    return auto_resample(bars, max_bars)[1]
+
+
+def adjusted(stored, new, seam):
+    # whether upstream now reports other prices for the final bar `seam`
+    if seam not in new.index:
+        return False
+    return not np.allclose(
+        stored.loc[seam, PRICES].to_numpy(dtype=float),
+        new.loc[seam, PRICES].to_numpy(dtype=float),
+        rtol=1e-6,
+    )
+
+
+def last_session_date(now):
+    # date of the last daily bar that can no longer change
+    today = now.date()
+    if is_trading_day(today) and get_market_status() in ("REGULAR", "POST"):
+        return today
+    return previous_trading_day(today)
+
+
+def session_close(d):
+    # New York time at which the regular session of `d` closes
+    return NEW_YORK.localize(datetime.combine(d, clock_time(*session_times(d)[2])))
+
+
+class HistoryStore:
+    # Daily bars are kept per ticker in memory and in `directory` as csv.
+    # Each update only asks upstream for bars from the last final stored bar
+    # on. When that bar comes back with other prices, a split or dividend
+    # adjusted the past and the whole stored span is downloaded again. A last
+    # bar fetched before its session closed is fetched again after the close.
+    def __init__(
+        self, fetch=fetch_history, directory=HISTORY_DIR, refresh=HISTORY_REFRESH
+    ):
+        self.fetch = fetch
+        self.directory = directory
+        self.refresh = refresh
+        self._bars = {}
+        self._checked = {}
+        self._fetched = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def path(self, company):
+        return os.path.join(self.directory, company + ".csv")
+
+    def bars(self, company, update=True):
+        with self._ticker_lock(company):
+            if update:
+                self._update(company)
+                return self._bars.get(company)
+            return self._load(company)
+
+    def window(self, company, duration="5y", update=True):
+        bars = self.bars(company, update)
+        if bars is None:
+            return None
+        if duration == "1d":
+            return bars.iloc[-1:].copy()
+        if duration == "ytd":
+            start = pd.Timestamp(datetime.now(NEW_YORK).year, 1, 1)
+        elif duration in windows:
+            start = pd.Timestamp(datetime.now(NEW_YORK).date()) - windows[duration]
+        else:
+            return bars.copy()
+        return bars.loc[start:].copy()
+
+    def _ticker_lock(self, company):
+        with self._lock:
+            return self._locks.setdefault(company, threading.Lock())
+
+    def _load(self, company):
+        if company not in self._bars and os.path.exists(self.path(company)):
+            bars = pd.read_csv(self.path(company), index_col=0, parse_dates=True)
+            self._bars[company] = bars[COLUMNS]
+            mtime = os.path.getmtime(self.path(company))
+            self._fetched[company] = datetime.fromtimestamp(mtime, NEW_YORK)
+        return self._bars.get(company)
+
+    def _save(self, company, bars):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.path(company) + ".%d.tmp" % os.getpid()
+        bars.to_csv(tmp)
+        os.replace(tmp, self.path(company))
+
+    def _update(self, company):
+        now = time.monotonic()
+        checked = self._checked.get(company)
+        if checked is not None and now - checked < self.refresh:
+            return
+
+        stored = self._load(company)
+        if stored is None or not len(stored):
+            bars = normalize_bars(self.fetch(company, period="5y"), company)
+            if bars is None:
+                return
+        else:
+            self._checked[company] = now
+            last = stored.index[-1].date()
+            final = last_session_date(datetime.now(NEW_YORK))
+            if last >= final and self._fetched[company] >= session_close(last):
+                return
+            # the last stored bar may have been stored while still forming
+            seam = stored.index[-2] if len(stored) > 1 else stored.index[-1]
+            try:
+                raw = self.fetch(company, start=seam.strftime("%Y-%m-%d"))
+                new = normalize_bars(raw, company)
+                if new is not None and adjusted(stored, new, seam):
+                    start = stored.index[0].strftime("%Y-%m-%d")
+                    stored = stored.iloc[:0]
+                    new = normalize_bars(self.fetch(company, start=start), company)
+            except Exception:
+                return
+            if new is None:
+                return
+            bars = pd.concat([stored[stored.index < new.index[0]], new])
+        self._checked[company] = now
+        self._fetched[company] = datetime.now(NEW_YORK)
+        self._bars[company] = bars
+        self._save(company, bars)
+
+
+history_store = HistoryStore()
+
+
+def get_history(company, duration="5y", interval="1d"):
+    bars = history_store.window(company, duration)
+    if interval == "auto":
+        return auto_resample(bars)[0]
+    return resample_bars(bars, interval)
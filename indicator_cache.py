@@ -0,0 +1,107 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from indicator_engine import compute_studies, resolve_params
+
+
+INDICATOR_CACHE_BYTES = int(os.environ.get("INDICATOR_CACHE_BYTES", 64 * 2 ** 20))
+
+
+def result_size(value):
+    if isinstance(value, tuple):
+        return sum(result_size(v) for v in value)
+    return np.asarray(value).nbytes
+
+
+def data_version(df):
+    # identifies a bar series: a forming last bar changes its values, not
+    # its timestamp
+    if not len(df):
+        return (0,)
+    last = df.iloc[-1]
+    return (
+        len(df),
+        str(df.index[0]),
+        str(df.index[-1]),
+        float(last["open"]),
+        float(last["high"]),
+        float(last["low"]),
+        float(last["close"]),
+        float(last["volume"]),
+    )
+
+
+class IndicatorCache:
+    # LRU of computed study arrays bounded by their total size in bytes
+    def __init__(self, max_bytes=INDICATOR_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value[0]
+
+    def put(self, key, value):
+        size = result_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._counters["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+indicator_cache = IndicatorCache()
+
+
+def cached_studies(company, duration, df, names, version=None, params=None):
+    if version is None:
+        version = data_version(df)
+    values = {}
+    missing = []
+    for name in names:
+        key = (
+            company,
+            duration,
+            version,
+            name,
+            tuple(sorted(resolve_params(name, params).items())),
+        )
+        value = indicator_cache.get(key)
+        if value is None:
+            missing.append((name, key))
+        else:
+            values[name] = value
+    if missing:
+        computed = compute_studies([name for name, _ in missing], df, params)
+        for name, key in missing:
+            indicator_cache.put(key, computed[name])
+            values[name] = computed[name]
+    return values
+
+
+def indicator_cache_stats():
+    return indicator_cache.stats()
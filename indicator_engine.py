@@ -0,0 +1,327 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+
+# rolling_mad materializes at most this many window elements at a time
+MAD_BLOCK = 1 << 17
+
+# Vectorized versions of the `ta` studies used by technical_indicators.py.
+# They take plain float arrays and return arrays aligned with their input,
+# with NaN where `ta` returns NaN.
+
+
+def shift(x, n=1):
+    out = np.full(len(x), np.nan)
+    if n < len(x):
+        out[n:] = x[: len(x) - n]
+    return out
+
+
+def ewm(x, alpha, min_periods=0):
+    # pandas ewm(adjust=False).mean() for series whose NaNs are all leading
+    out = np.full(len(x), np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if not len(valid):
+        return out
+    first = valid[0]
+    out[first:] = lfilter(
+        [alpha], [1, alpha - 1], x[first:], zi=[(1 - alpha) * x[first]]
+    )[0]
+    out[: first + max(min_periods, 1) - 1] = np.nan
+    return out
+
+
+def ema(x, span, min_periods=None):
+    return ewm(x, 2 / (span + 1), span if min_periods is None else min_periods)
+
+
+def rolling_windows(x, window):
+    out_len = len(x) - window + 1
+    if out_len <= 0:
+        return None
+    return sliding_window_view(x, window)
+
+
+def sma(x, window):
+    out = np.full(len(x), np.nan)
+    windows = rolling_windows(x, window)
+    if windows is not None:
+        out[window - 1 :] = windows.mean(axis=1)
+    return out
+
+
+def rolling_std(x, window):
+    out = np.full(len(x), np.nan)
+    windows = rolling_windows(x, window)
+    if windows is not None:
+        out[window - 1 :] = windows.std(axis=1)
+    return out
+
+
+def diff(x):
+    return x - shift(x)
+
+
+def rsi_from_diff(diff, window=14):
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    emaup = ewm(up, 1 / window, window)
+    emadn = ewm(down, 1 / window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(emadn == 0, 100, 100 - (100 / (1 + emaup / emadn)))
+
+
+def rsi(close, window=14):
+    return rsi_from_diff(diff(close), window)
+
+
+def roc(close, window=12):
+    prev = shift(close, window)
+    return (close - prev) / prev * 100
+
+
+def macd(close, window_slow=26, window_fast=12):
+    return ema(close, window_fast) - ema(close, window_slow)
+
+
+def bollinger(close, window=20, window_dev=2):
+    mavg = sma(close, window)
+    mstd = rolling_std(close, window)
+    return mavg + window_dev * mstd, mavg - window_dev * mstd, mavg
+
+
+def obv(close, volume):
+    return np.cumsum(np.where(close < shift(close), -volume, volume))
+
+
+def tsi_from_diff(diff, window_slow=25, window_fast=13):
+    smoothed = ema(ema(diff, window_slow), window_fast)
+    smoothed_abs = ema(ema(np.abs(diff), window_slow), window_fast)
+    return smoothed / smoothed_abs * 100
+
+
+def tsi(close, window_slow=25, window_fast=13):
+    return tsi_from_diff(diff(close), window_slow, window_fast)
+
+
+def true_range(high, low, close):
+    prev = shift(close)
+    ranges = np.vstack((high - low, np.abs(high - prev), np.abs(low - prev)))
+    return np.nanmax(ranges, axis=0)
+
+
+def atr_from_true_range(tr, window=14):
+    out = np.zeros(len(tr))
+    if len(tr) < window:
+        return out
+    seed = tr[:window].mean()
+    alpha = 1 / window
+    out[window - 1] = seed
+    if len(tr) > window:
+        out[window:] = lfilter(
+            [alpha], [1, alpha - 1], tr[window:], zi=[(1 - alpha) * seed]
+        )[0]
+    return out
+
+
+def atr(high, low, close, window=14):
+    return atr_from_true_range(true_range(high, low, close), window)
+
+
+def rolling_mad(x, window, mean=None):
+    # mean absolute deviation of each window around its own mean, the same
+    # reduction as ta's rolling apply, over blocks of windows that stay in
+    # cache instead of one len(x) x window temporary
+    out = np.full(len(x), np.nan)
+    windows = rolling_windows(x, window)
+    if windows is None:
+        return out
+    if mean is None:
+        mean = windows.mean(axis=1)
+    else:
+        mean = mean[window - 1 :]
+    rows = max(1, MAD_BLOCK // window)
+    mad = out[window - 1 :]
+    for start in range(0, len(windows), rows):
+        stop = start + rows
+        block = windows[start:stop] - mean[start:stop, None]
+        np.abs(block, out=block)
+        block.mean(axis=1, out=mad[start:stop])
+    return out
+
+
+def cci_from_typical(typical, window=14, constant=0.015, mean=None):
+    if mean is None:
+        mean = sma(typical, window)
+    mad = rolling_mad(typical, window, mean)
+    return (typical - mean) / (constant * mad)
+
+
+def cci(high, low, close, window=14, constant=0.015):
+    return cci_from_typical((high + low + close) / 3.0, window, constant)
+
+
+def ohlcv(df):
+    return {
+        column: df[column].to_numpy(dtype=float)
+        for column in ("open", "high", "low", "close", "volume")
+    }
+
+
+study_params = {
+    "RSI_trace": {"window": 14},
+    "ROC_trace": {"window": 12},
+    "MACD_trace": {"window_slow": 26, "window_fast": 12},
+    "OBV_trace": {},
+    # TSI_trace has always been computed on the high prices
+    "TSI_trace": {"window_slow": 25, "window_fast": 13, "source": "high"},
+    "ATR_trace": {"window": 14},
+    "CCI_trace": {"window": 14, "constant": 0.015},
+    "EMA_trace": {"window": 12},
+    "SMA_trace": {"window": 12},
+    "BOLLINGER_trace": {"window": 20, "window_dev": 2},
+}
+
+
+# Every study and every intermediate it needs is a node of a dependency
+# graph. A node is a function of an Evaluation and its parameters, asking
+# the evaluation for the nodes it depends on, so an intermediate shared by
+# several studies (close differences, an EMA or a rolling mean of close,
+# the typical price...) is computed once per evaluation.
+nodes = {}
+
+
+def node(name):
+    def decorator(fn):
+        nodes[name] = fn
+        return fn
+
+    return decorator
+
+
+class Evaluation:
+    def __init__(self, data):
+        self.data = data
+        self.memo = {}
+        self.computed = 0
+        self.reused = 0
+
+    def __call__(self, name, **params):
+        key = (name, tuple(sorted(params.items())))
+        if key in self.memo:
+            self.reused += 1
+        else:
+            self.memo[key] = nodes[name](self, **params)
+            self.computed += 1
+        return self.memo[key]
+
+
+for column in ("open", "high", "low", "close", "volume"):
+    node(column)(lambda ev, column=column: ev.data[column])
+
+
+@node("diff")
+def diff_node(ev, source="close"):
+    return diff(ev(source))
+
+
+@node("ema")
+def ema_node(ev, source="close", window=12):
+    return ema(ev(source), window)
+
+
+@node("sma")
+def sma_node(ev, source="close", window=12):
+    return sma(ev(source), window)
+
+
+@node("rolling_std")
+def rolling_std_node(ev, source="close", window=20):
+    return rolling_std(ev(source), window)
+
+
+@node("mad")
+def mad_node(ev, source="close", window=14):
+    return rolling_mad(ev(source), window, ev("sma", source=source, window=window))
+
+
+@node("typical")
+def typical_node(ev):
+    return (ev("high") + ev("low") + ev("close")) / 3.0
+
+
+@node("true_range")
+def true_range_node(ev):
+    return true_range(ev("high"), ev("low"), ev("close"))
+
+
+@node("RSI_trace")
+def rsi_node(ev, window=14):
+    return rsi_from_diff(ev("diff", source="close"), window)
+
+
+@node("ROC_trace")
+def roc_node(ev, window=12):
+    return roc(ev("close"), window)
+
+
+@node("MACD_trace")
+def macd_node(ev, window_slow=26, window_fast=12):
+    return ev("ema", source="close", window=window_fast) - ev(
+        "ema", source="close", window=window_slow
+    )
+
+
+@node("OBV_trace")
+def obv_node(ev):
+    return obv(ev("close"), ev("volume"))
+
+
+@node("TSI_trace")
+def tsi_node(ev, window_slow=25, window_fast=13, source="high"):
+    return tsi_from_diff(ev("diff", source=source), window_slow, window_fast)
+
+
+@node("ATR_trace")
+def atr_node(ev, window=14):
+    return atr_from_true_range(ev("true_range"), window)
+
+
+@node("CCI_trace")
+def cci_node(ev, window=14, constant=0.015):
+    typical = ev("typical")
+    mean = ev("sma", source="typical", window=window)
+    mad = ev("mad", source="typical", window=window)
+    return (typical - mean) / (constant * mad)
+
+
+@node("EMA_trace")
+def ema_trace_node(ev, window=12):
+    return ev("ema", source="close", window=window)
+
+
+@node("SMA_trace")
+def sma_trace_node(ev, window=12):
+    return ev("sma", source="close", window=window)
+
+
+@node("BOLLINGER_trace")
+def bollinger_node(ev, window=20, window_dev=2):
+    mavg = ev("sma", source="close", window=window)
+    mstd = ev("rolling_std", source="close", window=window)
+    return mavg + window_dev * mstd, mavg - window_dev * mstd, mavg
+
+
+def resolve_params(name, params=None):
+    merged = dict(study_params.get(name, {}))
+    if params and name in params:
+        merged.update(params[name])
+    return merged
+
+
+def compute_studies(names, df, params=None):
+    # columns are converted once and every node is evaluated at most once;
+    # `params` maps a study to the parameters overriding study_params
+    ev = Evaluation(ohlcv(df))
+    return {name: ev(name, **resolve_params(name, params)) for name in names}
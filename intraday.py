@@ -0,0 +1,181 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from yahooquery import Ticker
+from singleflight import coalesced
+from quote_cache import FIRST_POLL_WAIT
+from intraday_studies import SessionStudies
+
+
+CAPACITY = 1024
+INTRADAY_REFRESH = 30
+FIELDS = ["open", "high", "low", "close", "volume"]
+
+
+@coalesced
+def fetch_minutes(company, start=None):
+    if start is None:
+        return Ticker(company).history(period="1d", interval="1m", adj_timezone=False)
+    return Ticker(company).history(interval="1m", start=start, adj_timezone=False)
+
+
+def normalize_minutes(raw, company):
+    if not isinstance(raw, pd.DataFrame) or raw.empty:
+        return None
+    if isinstance(raw.index, pd.MultiIndex):
+        if company not in raw.index.get_level_values(0):
+            return None
+        raw = raw.loc[company]
+    index = pd.to_datetime(raw.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    bars = pd.DataFrame(
+        raw[FIELDS].to_numpy(dtype=float), index=index, columns=FIELDS
+    )
+    return bars.dropna(subset=["close"])
+
+
+class MinuteRing:
+    # Fixed-capacity buffer of 1-minute bars, oldest bars are overwritten
+    # once it is full and pushing the current minute again replaces it.
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype="datetime64[ns]")
+        self.values = np.zeros((capacity, len(FIELDS)))
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+
+    def last_time(self):
+        if not self.size:
+            return None
+        return self.times[(self.start + self.size - 1) % self.capacity]
+
+    def push(self, t, row):
+        if self.size:
+            last = (self.start + self.size - 1) % self.capacity
+            if t == self.times[last]:
+                self.values[last] = row
+                return
+            if t < self.times[last]:
+                return
+        if self.size < self.capacity:
+            i = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            i = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.times[i] = t
+        self.values[i] = row
+
+    def extend(self, times, values):
+        for t, row in zip(times, values):
+            self.push(t, row)
+
+    def frame(self):
+        idx = (self.start + np.arange(self.size)) % self.capacity
+        return pd.DataFrame(
+            self.values[idx], index=pd.DatetimeIndex(self.times[idx]), columns=FIELDS
+        )
+
+
+class IntradayStore:
+    # Keeps the current session of 1-minute bars per ticker. Updates only
+    # request the minutes from the last stored bar on, a bar from a newer
+    # day starts a new session. Tickers followed by the poller are only
+    # updated by its cycles, reads never fetch them.
+    def __init__(
+        self, fetch=fetch_minutes, refresh=INTRADAY_REFRESH, capacity=CAPACITY
+    ):
+        self.fetch = fetch
+        self.refresh = refresh
+        self.capacity = capacity
+        self._rings = {}
+        self._studies = {}
+        self._updated = {}
+        self._followed = frozenset()
+        self._ready = None
+        self._lock = threading.Lock()
+
+    def ingest(self, company, bars):
+        if bars is None or bars.empty:
+            return
+        times = bars.index.values.astype("datetime64[ns]")
+        values = bars[FIELDS].to_numpy(dtype=float)
+        day = times[-1].astype("datetime64[D]")
+        with self._lock:
+            ring = self._rings.setdefault(company, MinuteRing(self.capacity))
+            last = ring.last_time()
+            if last is None or last.astype("datetime64[D]") < day:
+                ring.clear()
+                self._studies[company] = SessionStudies(day)
+            keep = times.astype("datetime64[D]") == day
+            ring.extend(times[keep], values[keep])
+            self._studies[company].extend(times[keep], values[keep])
+            self._updated[company] = time.monotonic()
+
+    def last_time(self, company):
+        with self._lock:
+            ring = self._rings.get(company)
+            return None if ring is None else ring.last_time()
+
+    def common_start(self, companies):
+        # earliest last bar among `companies`, None when one of them is empty
+        starts = [self.last_time(company) for company in companies]
+        if not starts or any(s is None for s in starts):
+            return None
+        return pd.Timestamp(min(starts)).to_pydatetime()
+
+    def follow(self, companies, ready):
+        # `ready` is set once the poller's first cycle is over
+        self._followed = frozenset(companies)
+        self._ready = ready
+
+    def update(self, company):
+        if company in self._followed:
+            self._ready.wait(FIRST_POLL_WAIT)
+            return
+        updated = self._updated.get(company)
+        if updated is not None and time.monotonic() - updated < self.refresh:
+            return
+        self._updated[company] = time.monotonic()
+        last = self.last_time(company)
+        start = None if last is None else pd.Timestamp(last).to_pydatetime()
+        try:
+            raw = self.fetch(company, start)
+        except Exception:
+            return
+        self.ingest(company, normalize_minutes(raw, company))
+
+    def bars(self, company):
+        self.update(company)
+        with self._lock:
+            ring = self._rings.get(company)
+            if ring is None or not len(ring):
+                return None
+            return ring.frame()
+
+    def studies(self, company):
+        # session VWAP, anchored VWAP and volume profile of the stored minutes
+        self.update(company)
+        with self._lock:
+            studies = self._studies.get(company)
+            return None if studies is None else studies.snapshot()
+
+
+intraday_store = IntradayStore()
+
+
+def get_intraday(company):
+    return intraday_store.bars(company)
+
+
+def get_intraday_studies(company):
+    return intraday_store.studies(company)
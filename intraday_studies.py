@@ -0,0 +1,165 @@
+import math
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytz
+from market_session import NEW_YORK
+from streaming_indicators import IndicatorStream
+
+
+# New York time the anchored VWAP starts from, the end of the opening range
+ANCHOR_TIME = (10, 0)
+# studies of streaming_indicators.py kept over the session's minutes
+MINUTE_STUDIES = ["EMA_trace"]
+
+
+def typical_price(row):
+    # row in intraday FIELDS order: open, high, low, close, volume
+    return (row[1] + row[2] + row[3]) / 3.0
+
+
+def traded(row):
+    # volume of a minute, yahooquery sometimes leaves it NaN
+    return 0.0 if math.isnan(row[4]) else row[4]
+
+
+def anchor_time(day, at=ANCHOR_TIME):
+    # naive UTC timestamp, like the minute bars, of `at` New York time on `day`
+    t = NEW_YORK.localize(datetime(day.year, day.month, day.day, *at))
+    return np.datetime64(t.astimezone(pytz.utc).replace(tzinfo=None), "ns")
+
+
+def bin_size(price):
+    # about a thousandth of the price, rounded down to a power of ten
+    return 10.0 ** (math.floor(math.log10(price)) - 3) if price > 0 else 0.01
+
+
+class VWAP:
+    # Volume weighted average of the typical price from `anchor` on (the
+    # whole session when None). Pushing the last minute again replaces its
+    # contribution, like MinuteRing.push.
+    def __init__(self, anchor=None):
+        self.anchor = anchor
+        self.pv = 0.0
+        self.volume = 0.0
+        self.last = None
+        self.times = []
+        self.values = []
+
+    def push(self, t, row):
+        if self.anchor is not None and t < self.anchor:
+            return
+        if self.last is not None:
+            if t < self.last[0]:
+                return
+            if t == self.last[0]:
+                self.pv -= self.last[1]
+                self.volume -= self.last[2]
+                self.times.pop()
+                self.values.pop()
+        volume = traded(row)
+        pv = typical_price(row) * volume
+        self.pv += pv
+        self.volume += volume
+        self.last = (t, pv, volume)
+        self.times.append(t)
+        self.values.append(self.pv / self.volume if self.volume else typical_price(row))
+
+    def series(self):
+        return pd.Series(self.values, index=pd.DatetimeIndex(self.times), dtype=float)
+
+
+class VolumeProfile:
+    # Session volume traded per price bin, each minute's volume counted at
+    # its typical price
+    def __init__(self, size=None):
+        self.size = size
+        self.volumes = {}
+        self.last = None
+
+    def push(self, t, row):
+        if self.last is not None:
+            if t < self.last[0]:
+                return
+            if t == self.last[0]:
+                self.volumes[self.last[1]] -= self.last[2]
+        if self.size is None:
+            self.size = bin_size(row[3])
+        price_bin = int(round(typical_price(row) / self.size))
+        volume = traded(row)
+        self.volumes[price_bin] = self.volumes.get(price_bin, 0.0) + volume
+        self.last = (t, price_bin, volume)
+
+    def profile(self):
+        bins = np.array(sorted(b for b, v in self.volumes.items() if v > 0))
+        if not len(bins):
+            return pd.Series(dtype=float)
+        return pd.Series(
+            [self.volumes[b] for b in bins], index=bins * self.size, dtype=float
+        )
+
+
+class MinuteStudies:
+    # streaming_indicators studies of the session's minutes, pushing the last
+    # minute again revises it with replace=True
+    def __init__(self, names=MINUTE_STUDIES):
+        self.stream = IndicatorStream(names)
+        self.last = None
+        self.times = []
+        self.values = {name: [] for name in names}
+
+    def push(self, t, row):
+        if self.last is not None and t < self.last:
+            return
+        replace = t == self.last
+        bar = {
+            "open": row[0],
+            "high": row[1],
+            "low": row[2],
+            "close": row[3],
+            "volume": row[4],
+        }
+        values = self.stream.update(bar, replace=replace)
+        if not replace:
+            self.times.append(t)
+        for name, value in values.items():
+            if replace:
+                self.values[name][-1] = value
+            else:
+                self.values[name].append(value)
+        self.last = t
+
+    def series(self):
+        index = pd.DatetimeIndex(self.times)
+        return {
+            name: pd.Series(values, index=index, dtype=float)
+            for name, values in self.values.items()
+        }
+
+
+class SessionStudies:
+    # The intraday studies of one ticker's session, fed the same minutes as
+    # its MinuteRing so every new bar costs a constant amount of work
+    def __init__(self, day):
+        self.vwap = VWAP()
+        self.anchored_vwap = VWAP(anchor_time(pd.Timestamp(day)))
+        self.profile = VolumeProfile()
+        self.minutes = MinuteStudies()
+
+    def push(self, t, row):
+        self.vwap.push(t, row)
+        self.anchored_vwap.push(t, row)
+        self.profile.push(t, row)
+        self.minutes.push(t, row)
+
+    def extend(self, times, values):
+        for t, row in zip(times, values):
+            self.push(t, row)
+
+    def snapshot(self):
+        return {
+            "vwap": self.vwap.series(),
+            "anchored_vwap": self.anchored_vwap.series(),
+            "profile": self.profile.profile(),
+            **self.minutes.series(),
+        }
@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pytz import timezone
+from yahoo_fin import stock_info as si
+
+
+NEW_YORK = timezone("America/New_York")
+
+PRE_OPEN = (4, 0)
+REGULAR_OPEN = (9, 30)
+REGULAR_CLOSE = (16, 0)
+POST_CLOSE = (20, 0)
+HALF_DAY_CLOSE = (13, 0)
+HALF_DAY_POST_CLOSE = (17, 0)
+
+# one-off closures that do not follow any calendar rule
+SPECIAL_CLOSURES = {
+    date(2012, 10, 29),
+    date(2012, 10, 30),
+    date(2018, 12, 5),
+    date(2025, 1, 9),
+}
+
+REMOTE_CONFIRM = os.environ.get("MARKET_STATUS_CONFIRM", "0") == "1"
+REMOTE_TTL = 60
+
+
+def easter(year):
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year, month, weekday, n):
+    d = date(year, month, 1)
+    d += timedelta(days=(weekday - d.weekday()) % 7)
+    return d + timedelta(weeks=n - 1)
+
+
+def last_weekday(year, month, weekday):
+    d = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def observed(d):
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year):
+    holidays = set()
+    new_year = date(year, 1, 1)
+    # NYSE does not close on Friday Dec 31 when Jan 1 falls on a Saturday
+    if new_year.weekday() != 5:
+        holidays.add(observed(new_year))
+    holidays.add(nth_weekday(year, 1, 0, 3))
+    holidays.add(nth_weekday(year, 2, 0, 3))
+    holidays.add(easter(year) - timedelta(days=2))
+    holidays.add(last_weekday(year, 5, 0))
+    if year >= 2022:
+        holidays.add(observed(date(year, 6, 19)))
+    holidays.add(observed(date(year, 7, 4)))
+    holidays.add(nth_weekday(year, 9, 0, 1))
+    holidays.add(nth_weekday(year, 11, 3, 4))
+    holidays.add(observed(date(year, 12, 25)))
+    holidays.update(d for d in SPECIAL_CLOSURES if d.year == year)
+    return frozenset(holidays)
+
+
+@lru_cache(maxsize=None)
+def nyse_half_days(year):
+    holidays = nyse_holidays(year)
+    candidates = [
+        date(year, 7, 3),
+        nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+    return frozenset(d for d in candidates if d.weekday() < 5 and d not in holidays)
+
+
+def is_trading_day(d):
+    return d.weekday() < 5 and d not in nyse_holidays(d.year)
+
+
+def previous_trading_day(d):
+    d -= timedelta(days=1)
+    while not is_trading_day(d):
+        d -= timedelta(days=1)
+    return d
+
+
+def next_trading_day(d):
+    d += timedelta(days=1)
+    while not is_trading_day(d):
+        d += timedelta(days=1)
+    return d
+
+
+def session_times(d):
+    if d in nyse_half_days(d.year):
+        return PRE_OPEN, REGULAR_OPEN, HALF_DAY_CLOSE, HALF_DAY_POST_CLOSE
+    return PRE_OPEN, REGULAR_OPEN, REGULAR_CLOSE, POST_CLOSE
+
+
+def local_market_status(now=None):
+    if now is None:
+        now = datetime.now(NEW_YORK)
+    elif now.tzinfo is None:
+        now = NEW_YORK.localize(now)
+    else:
+        now = now.astimezone(NEW_YORK)
+
+    today = now.date()
+    if not is_trading_day(today):
+        return "CLOSED"
+
+    pre_open, regular_open, regular_close, post_close = session_times(today)
+    hm = (now.hour, now.minute)
+    if hm < pre_open or hm >= post_close:
+        return "CLOSED"
+    if hm < regular_open:
+        return "PRE"
+    if hm < regular_close:
+        return "REGULAR"
+    return "POST"
+
+
+class RemoteStatus:
+    # Remote confirmation runs in the background at most once per `ttl`
+    # seconds, callers never wait on it.
+    def __init__(self, ttl=REMOTE_TTL):
+        self.ttl = ttl
+        self.value = None
+        self.checked = None
+        self._lock = threading.Lock()
+        self._running = False
+
+    def get(self):
+        now = time.monotonic()
+        with self._lock:
+            fresh = self.checked is not None and now - self.checked < self.ttl
+            if not fresh and not self._running:
+                self._running = True
+                threading.Thread(target=self._refresh, daemon=True).start()
+            return self.value if fresh else None
+
+    def _refresh(self):
+        try:
+            value = si.get_market_status()
+        except Exception:
+            value = None
+        with self._lock:
+            self.value = value
+            self.checked = time.monotonic()
+            self._running = False
+
+
+remote_status = RemoteStatus()
+
+
+def get_market_status(now=None):
+    status = local_market_status(now)
+    if REMOTE_CONFIRM and now is None:
+        remote = remote_status.get()
+        if remote in ("PRE", "REGULAR", "POST", "CLOSED"):
+            return remote
+        if remote == "POSTPOST":
+            return "POST"
+        if remote == "PREPRE":
+            return "CLOSED"
+    return status
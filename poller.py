@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from yahooquery import Ticker
+from market_session import get_market_status
+from quote_cache import quote_cache
+from intraday import intraday_store, normalize_minutes
+
+
+POLL_INTERVAL = float(os.environ.get("POLL_INTERVAL", 30))
+POLL_INTERVAL_CLOSED = float(os.environ.get("POLL_INTERVAL_CLOSED", 600))
+# seconds between full-day requests for symbols Yahoo returned no minutes for
+POLL_EMPTY_RETRY = float(os.environ.get("POLL_EMPTY_RETRY", 300))
+
+
+class Poller:
+    # One batched Yahoo request per cycle for the whole universe: quotes are
+    # published to the shared quote cache and the newest minutes to the
+    # intraday store, so the upstream volume does not depend on the number
+    # of sessions. Callbacks only read what it publishes for these symbols.
+    # Symbols without minutes yet get the whole day in a separate request,
+    # retried every `empty_retry` seconds for those Yahoo no longer serves.
+    def __init__(
+        self,
+        symbols,
+        interval=POLL_INTERVAL,
+        closed_interval=POLL_INTERVAL_CLOSED,
+        empty_retry=POLL_EMPTY_RETRY,
+    ):
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.closed_interval = closed_interval
+        self.empty_retry = empty_retry
+        self._updated = None
+        self._empty_polled = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.ready = threading.Event()
+        self._counters = {"cycles": 0, "errors": 0, "last_cycle_seconds": None}
+
+    def start(self):
+        if self._thread is None:
+            quote_cache.follow(self.symbols, self.ready)
+            intraday_store.follow(self.symbols, self.ready)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def poll(self):
+        started = time.monotonic()
+        ticker = Ticker(self.symbols, asynchronous=True)
+        quotes = ticker.quotes
+        if isinstance(quotes, dict):
+            for symbol in self.symbols:
+                if isinstance(quotes.get(symbol), dict):
+                    quote_cache.put(symbol, quotes[symbol])
+
+        filled = [s for s in self.symbols if intraday_store.last_time(s) is not None]
+        empty = [s for s in self.symbols if s not in filled]
+        if filled:
+            ticker.symbols = filled
+            start = intraday_store.common_start(filled)
+            bars = ticker.history(interval="1m", start=start, adj_timezone=False)
+            self._ingest(filled, bars)
+        if empty and (
+            self._empty_polled is None
+            or started - self._empty_polled >= self.empty_retry
+        ):
+            ticker.symbols = empty
+            bars = ticker.history(period="1d", interval="1m", adj_timezone=False)
+            self._empty_polled = started
+            self._ingest(empty, bars)
+
+        with self._lock:
+            self._updated = time.monotonic()
+            self._counters["cycles"] += 1
+            self._counters["last_cycle_seconds"] = time.monotonic() - started
+
+    def _ingest(self, symbols, bars):
+        for symbol in symbols:
+            intraday_store.ingest(symbol, normalize_minutes(bars, symbol))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["symbols"] = len(self.symbols)
+            stats["age_seconds"] = (
+                None if self._updated is None else time.monotonic() - self._updated
+            )
+        return stats
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                with self._lock:
+                    self._counters["errors"] += 1
+            self.ready.set()
+            if get_market_status() == "CLOSED":
+                self._stop.wait(self.closed_interval)
+            else:
+                self._stop.wait(self.interval)
+
+
+poller = None
+
+
+def start_poller(symbols):
+    global poller
+    if poller is None:
+        poller = Poller(symbols).start()
+    return poller
+
+
+def poller_stats():
+    return None if poller is None else poller.stats()
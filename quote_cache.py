@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from yahooquery import Ticker
+from singleflight import coalesced
+
+
+QUOTE_TTL = float(os.environ.get("QUOTE_TTL", 30))
+QUOTE_MAX_STALE = float(os.environ.get("QUOTE_MAX_STALE", 300))
+# longest a callback waits for the poller's first cycle
+FIRST_POLL_WAIT = float(os.environ.get("FIRST_POLL_WAIT", 10))
+
+
+@coalesced
+def fetch_quote(company):
+    return Ticker(company).quotes[company]
+
+
+class QuoteCache:
+    # Fresh entries are served as is, entries older than `ttl` but younger than
+    # `ttl + max_stale` are served while a background refresh runs, anything
+    # older is fetched synchronously. Symbols followed by the poller are never
+    # fetched here: their last published quote is served whatever its age.
+    def __init__(self, fetch=fetch_quote, ttl=QUOTE_TTL, max_stale=QUOTE_MAX_STALE):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries = {}
+        self._refreshing = set()
+        self._followed = frozenset()
+        self._ready = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "fetches": 0, "errors": 0}
+
+    def follow(self, symbols, ready):
+        # `ready` is set once the poller's first cycle is over
+        with self._lock:
+            self._followed = frozenset(symbols)
+            self._ready = ready
+
+    def get(self, company):
+        if company in self._followed:
+            return self._published(company)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(company)
+            if entry is not None:
+                age = now - entry[0]
+                if age < self.ttl:
+                    self._counters["hits"] += 1
+                    return dict(entry[1])
+                if age < self.ttl + self.max_stale:
+                    self._counters["stale_hits"] += 1
+                    if company not in self._refreshing:
+                        self._refreshing.add(company)
+                        threading.Thread(
+                            target=self._refresh, args=(company,), daemon=True
+                        ).start()
+                    return dict(entry[1])
+            self._counters["misses"] += 1
+        quote = self._load(company)
+        return dict(quote) if isinstance(quote, dict) else quote
+
+    def _published(self, company):
+        self._ready.wait(FIRST_POLL_WAIT)
+        with self._lock:
+            entry = self._entries.get(company)
+            if entry is None:
+                self._counters["misses"] += 1
+                raise LookupError("no quote published for %s" % company)
+            self._counters["hits"] += 1
+            return dict(entry[1])
+
+    def put(self, company, quote):
+        if isinstance(quote, dict):
+            with self._lock:
+                self._entries[company] = (time.monotonic(), quote)
+
+    def invalidate(self, company=None):
+        with self._lock:
+            if company is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(company, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+        served = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = (
+            (stats["hits"] + stats["stale_hits"]) / served if served else 0.0
+        )
+        return stats
+
+    def _load(self, company):
+        with self._lock:
+            self._counters["fetches"] += 1
+        try:
+            quote = self.fetch(company)
+        except Exception:
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        self.put(company, quote)
+        return quote
+
+    def _refresh(self, company):
+        try:
+            self._load(company)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(company)
+
+
+quote_cache = QuoteCache()
+
+
+def get_quote(company):
+    return quote_cache.get(company)
+
+
+def quote_stats():
+    return quote_cache.stats()
@@ -0,0 +1,179 @@
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from history_store import get_history
+from market_session import (
+    NEW_YORK,
+    is_trading_day,
+    previous_trading_day,
+    session_times,
+)
+
+
+TRADING_DAYS = 252
+RISK_WINDOW = 252
+BENCHMARK = "^GSPC"
+RISK_COLUMNS = ["return", "volatility", "max_drawdown", "sharpe", "sortino", "beta"]
+
+
+# Rolling kernels over a (tickers x days) matrix of daily values, one row per
+# ticker, computed for all rows at once. A window containing a missing value
+# (a ticker listed later, a missing bar) gives NaN.
+
+
+def rolling_sum(x, window):
+    valid = ~np.isnan(x)
+    pad = np.zeros(x.shape[:-1] + (1,))
+    sums = np.concatenate((pad, np.cumsum(np.where(valid, x, 0.0), axis=-1)), -1)
+    counts = np.concatenate((pad, np.cumsum(valid, axis=-1)), -1)
+    out = np.full(x.shape, np.nan)
+    full = counts[..., window:] - counts[..., :-window] == window
+    out[..., window - 1 :] = np.where(
+        full, sums[..., window:] - sums[..., :-window], np.nan
+    )
+    return out
+
+
+def daily_returns(closes):
+    returns = np.full(closes.shape, np.nan)
+    returns[..., 1:] = closes[..., 1:] / closes[..., :-1] - 1
+    return returns
+
+
+def rolling_mean(x, window):
+    return rolling_sum(x, window) / window
+
+
+def rolling_volatility(returns, window=RISK_WINDOW):
+    # annualized standard deviation of daily returns
+    total = rolling_sum(returns, window)
+    squares = rolling_sum(returns * returns, window)
+    variance = np.maximum(squares - total * total / window, 0) / (window - 1)
+    return np.sqrt(variance * TRADING_DAYS)
+
+
+def rolling_sharpe(returns, window=RISK_WINDOW, risk_free=0.0):
+    excess = returns - risk_free / TRADING_DAYS
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (
+            rolling_mean(excess, window)
+            * TRADING_DAYS
+            / rolling_volatility(excess, window)
+        )
+
+
+def rolling_sortino(returns, window=RISK_WINDOW, risk_free=0.0):
+    excess = returns - risk_free / TRADING_DAYS
+    downside = np.minimum(excess, 0)
+    downside_deviation = np.sqrt(rolling_mean(downside * downside, window))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (
+            rolling_mean(excess, window)
+            * np.sqrt(TRADING_DAYS)
+            / downside_deviation
+        )
+
+
+def rolling_beta(returns, market, window=RISK_WINDOW):
+    # market: daily returns of the benchmark, one row broadcast to every ticker
+    market = np.broadcast_to(market, returns.shape)
+    missing = np.isnan(returns) | np.isnan(market)
+    x = np.where(missing, np.nan, returns)
+    m = np.where(missing, np.nan, market)
+    sum_x, sum_m = rolling_sum(x, window), rolling_sum(m, window)
+    covariance = rolling_sum(x * m, window) - sum_x * sum_m / window
+    variance = rolling_sum(m * m, window) - sum_m * sum_m / window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return covariance / variance
+
+
+def rolling_max_drawdown(closes, window=RISK_WINDOW):
+    # worst fall from a running peak within each window of closes, as a
+    # negative fraction
+    out = np.full(closes.shape, np.nan)
+    if closes.shape[-1] < window:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(closes, window, axis=-1)
+    peaks = np.fmax.accumulate(windows, axis=-1)
+    with np.errstate(invalid="ignore"):
+        out[..., window - 1 :] = np.min(windows / peaks - 1, axis=-1)
+    return out
+
+
+def closed_session_date(now):
+    # date of the last session whose daily bar is final
+    today = now.date()
+    if is_trading_day(today) and (now.hour, now.minute) >= session_times(today)[2]:
+        return today
+    return previous_trading_day(today)
+
+
+def load_closes(tickers, until, duration="2y"):
+    closes = {}
+    for ticker in tickers:
+        try:
+            bars = get_history(ticker, duration)
+        except Exception:
+            continue
+        if bars is not None and len(bars):
+            closes[ticker] = bars.close.loc[: pd.Timestamp(until)]
+    return pd.DataFrame(closes).sort_index()
+
+
+def risk_table(closes, benchmark, window=RISK_WINDOW):
+    # last value of every metric for each column of `closes`, a frame of
+    # daily closes indexed by date
+    values = closes.to_numpy(dtype=float).T
+    returns = daily_returns(values)
+    market = np.full(values.shape[-1], np.nan)
+    if benchmark is not None:
+        market = daily_returns(benchmark.reindex(closes.index).to_numpy(dtype=float))
+    metrics = {
+        "return": rolling_sum(np.log1p(returns), window),
+        "volatility": rolling_volatility(returns, window),
+        "max_drawdown": rolling_max_drawdown(values, window),
+        "sharpe": rolling_sharpe(returns, window),
+        "sortino": rolling_sortino(returns, window),
+        "beta": rolling_beta(returns, market, window),
+    }
+    metrics["return"] = np.expm1(metrics["return"])
+    return pd.DataFrame(
+        {name: metric[:, -1] for name, metric in metrics.items()},
+        index=closes.columns,
+        columns=RISK_COLUMNS,
+    )
+
+
+class RiskCache:
+    # Metrics of a whole ticker universe computed in one batch and kept
+    # until a new daily bar closes
+    def __init__(self, benchmark=BENCHMARK, window=RISK_WINDOW):
+        self.benchmark = benchmark
+        self.window = window
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def table(self, tickers):
+        tickers = tuple(sorted(set(tickers)))
+        session = closed_session_date(datetime.now(NEW_YORK))
+        with self._lock:
+            cached = self._tables.get(tickers)
+            if cached is not None and cached[0] == session:
+                return cached[1]
+            closes = load_closes(tickers + (self.benchmark,), session)
+            benchmark = closes.pop(self.benchmark) if self.benchmark in closes else None
+            table = risk_table(closes, benchmark, self.window)
+            self._tables[tickers] = (session, table)
+            return table
+
+
+risk_cache = RiskCache()
+
+
+def get_risk_metrics(company, universe=()):
+    # the universe, typically every ticker of the dropdown, shares one batch
+    table = risk_cache.table(tuple(universe) + (company,))
+    if company not in table.index:
+        return {}
+    return table.loc[company].to_dict()
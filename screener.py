@@ -0,0 +1,98 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from history_store import HISTORY_DIR, HistoryStore
+from indicator_engine import Evaluation, ohlcv, resolve_params
+
+
+SCREEN_STUDIES = ["RSI_trace", "MACD_trace", "CCI_trace"]
+CHUNK_SIZE = 64
+
+
+def last_value(value, close):
+    if isinstance(value, tuple):
+        # Bollinger bands: position of the close inside the bands (%B)
+        hband, lband = value[0][-1], value[1][-1]
+        return (close - lband) / (hband - lband) if hband != lband else np.nan
+    return value[-1]
+
+
+def screen_chunk(tickers, studies, duration, params, directory):
+    store = HistoryStore(directory=directory)
+    rows = []
+    for ticker in tickers:
+        try:
+            bars = store.window(ticker, duration, update=False)
+        except Exception:
+            continue
+        if bars is None or not len(bars):
+            continue
+        ev = Evaluation(ohlcv(bars))
+        close = ev("close")[-1]
+        row = {"ticker": ticker, "date": bars.index[-1], "close": close}
+        for name in studies:
+            row[name] = last_value(ev(name, **resolve_params(name, params)), close)
+        rows.append(row)
+    return rows
+
+
+def screen(
+    tickers,
+    studies=SCREEN_STUDIES,
+    duration="1y",
+    sort_by=None,
+    ascending=False,
+    params=None,
+    processes=None,
+    chunk_size=CHUNK_SIZE,
+    directory=HISTORY_DIR,
+):
+    # Ranks `tickers` on the last value of `studies`, computed from the bars
+    # already in the local history store. Chunks of tickers are spread over
+    # a process pool, each chunk loading and evaluating its bars in one go.
+    studies = list(studies)
+    if not studies:
+        raise ValueError("screen needs at least one study to rank on")
+    tickers = list(dict.fromkeys(tickers))
+    chunks = [tickers[i : i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    args = [(chunk, studies, duration, params, directory) for chunk in chunks]
+    if processes == 1 or len(chunks) <= 1:
+        results = [screen_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(screen_chunk, *zip(*args)))
+
+    table = pd.DataFrame(
+        [row for rows in results for row in rows],
+        columns=["ticker", "date", "close"] + studies,
+    ).set_index("ticker")
+    sort_by = sort_by or studies[0]
+    table = table.sort_values(sort_by, ascending=ascending, na_position="last")
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank stored tickers by studies")
+    parser.add_argument("tickers", nargs="*")
+    parser.add_argument("--studies", nargs="+", default=SCREEN_STUDIES)
+    parser.add_argument("--duration", default="1y")
+    parser.add_argument("--sort-by")
+    parser.add_argument("--ascending", action="store_true")
+    parser.add_argument("--processes", type=int)
+    args = parser.parse_args()
+    tickers = args.tickers or sorted(
+        f[:-4] for f in os.listdir(HISTORY_DIR) if f.endswith(".csv")
+    )
+    print(
+        screen(
+            tickers,
+            args.studies,
+            args.duration,
+            args.sort_by,
+            args.ascending,
+            processes=args.processes,
+        ).to_string()
+    )
@@ -0,0 +1,75 @@
+import threading
+from functools import wraps
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    # Concurrent calls sharing a key wait for the first one (the leader) and
+    # all get its result or its exception.
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        name = key[0] if isinstance(key, tuple) else key
+        with self._lock:
+            counters = self._counters.setdefault(
+                name, {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+            )
+            counters["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                counters["executions"] += 1
+            else:
+                counters["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn(*args, **kwargs)
+            except Exception as e:
+                call.error = e
+                with self._lock:
+                    counters["errors"] += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            stats = {name: dict(c) for name, c in self._counters.items()}
+            in_flight = len(self._calls)
+        return {"in_flight": in_flight, "keys": stats}
+
+
+singleflight = SingleFlight()
+
+
+def coalesced(fn):
+    name = fn.__module__ + "." + fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        return singleflight.do(key, fn, *args, **kwargs)
+
+    return wrapper
+
+
+def singleflight_stats():
+    return singleflight.stats()
@@ -0,0 +1,47 @@
+import json
+import os
+import plotly
+from dash import dcc, html
+import dash_bootstrap_components as dbc
+import dash_daq as daq
+from history_store import DATA_DIR
+
+
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "snapshot.json")
+
+namespaces = {
+    "dash_html_components": html,
+    "dash_core_components": dcc,
+    "dash_bootstrap_components": dbc,
+    "dash_daq": daq,
+}
+
+
+def component_from_json(obj):
+    if isinstance(obj, list):
+        return [component_from_json(o) for o in obj]
+    if not isinstance(obj, dict):
+        return obj
+    if set(obj) == {"type", "namespace", "props"} and obj["namespace"] in namespaces:
+        component = getattr(namespaces[obj["namespace"]], obj["type"])
+        return component(
+            **{k: component_from_json(v) for k, v in obj["props"].items()}
+        )
+    return {k: component_from_json(v) for k, v in obj.items()}
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    try:
+        with open(path) as f:
+            panels = json.load(f)
+        return {name: component_from_json(panel) for name, panel in panels.items()}
+    except Exception:
+        return {}
+
+
+def save_snapshot(panels, path=SNAPSHOT_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".%d.tmp" % os.getpid()
+    with open(tmp, "w") as f:
+        json.dump(panels, f, cls=plotly.utils.PlotlyJSONEncoder)
+    os.replace(tmp, path)
@@ -0,0 +1,307 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+# Incremental versions of the indicator_engine studies. Every indicator
+# absorbs one bar (a mapping with open/high/low/close/volume) per update in
+# constant time and returns the new value, matching the engine on the same
+# series. checkpoint() gives a JSON-serializable state that restore() turns
+# back into an indicator.
+
+nan = float("nan")
+# running window sums are recomputed exactly every RESYNC updates so that
+# rounding errors do not accumulate on long streams
+RESYNC = 1024
+
+
+class StreamingIndicator(ABC):
+    @abstractmethod
+    def update(self, bar):
+        pass
+
+    def checkpoint(self):
+        state = {}
+        for key, value in vars(self).items():
+            if isinstance(value, StreamingIndicator):
+                value = {"indicator": value.checkpoint()}
+            elif isinstance(value, deque):
+                value = {"deque": list(value), "maxlen": value.maxlen}
+            state[key] = value
+        return {"type": type(self).__name__, "state": state}
+
+
+class EMA(StreamingIndicator):
+    # pandas ewm(adjust=False) with leading NaNs skipped and min_periods
+    def __init__(self, span=None, alpha=None, min_periods=None, field="close"):
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.min_periods = span if min_periods is None else min_periods
+        self.field = field
+        self.value = None
+        self.count = 0
+
+    def push(self, x):
+        if x is None or math.isnan(x):
+            if self.value is None:
+                return nan
+        elif self.value is None:
+            self.value = x
+            self.count = 1
+        else:
+            self.value += self.alpha * (x - self.value)
+            self.count += 1
+        return self.value if self.count >= max(self.min_periods, 1) else nan
+
+    def update(self, bar):
+        return self.push(bar[self.field])
+
+
+class SMA(StreamingIndicator):
+    def __init__(self, window=12, field="close"):
+        self.window = window
+        self.field = field
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.pushes = 0
+
+    def push(self, x):
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+        self.pushes += 1
+        if self.pushes % RESYNC == 0:
+            self.total = math.fsum(self.values)
+        if len(self.values) < self.window:
+            return nan
+        return self.total / self.window
+
+    def update(self, bar):
+        return self.push(bar[self.field])
+
+
+class Bollinger(StreamingIndicator):
+    def __init__(self, window=20, window_dev=2, field="close"):
+        self.window = window
+        self.window_dev = window_dev
+        self.field = field
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.pushes = 0
+
+    def update(self, bar):
+        x = bar[self.field]
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+        self.pushes += 1
+        if self.pushes % RESYNC == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+        if len(self.values) < self.window:
+            return nan, nan, nan
+        mavg = self.total / self.window
+        mstd = math.sqrt(max(self.total_sq / self.window - mavg * mavg, 0.0))
+        return (
+            mavg + self.window_dev * mstd,
+            mavg - self.window_dev * mstd,
+            mavg,
+        )
+
+
+class RSI(StreamingIndicator):
+    def __init__(self, window=14):
+        self.prev = None
+        self.up = EMA(alpha=1 / window, min_periods=window)
+        self.down = EMA(alpha=1 / window, min_periods=window)
+
+    def update(self, bar):
+        close = bar["close"]
+        diff = 0.0 if self.prev is None else close - self.prev
+        self.prev = close
+        emaup = self.up.push(max(diff, 0.0))
+        emadn = self.down.push(max(-diff, 0.0))
+        if emadn == 0:
+            return 100.0
+        if math.isnan(emadn):
+            return nan
+        return 100 - 100 / (1 + emaup / emadn)
+
+
+class ROC(StreamingIndicator):
+    def __init__(self, window=12):
+        self.closes = deque(maxlen=window + 1)
+
+    def update(self, bar):
+        self.closes.append(bar["close"])
+        if len(self.closes) < self.closes.maxlen:
+            return nan
+        prev = self.closes[0]
+        return (self.closes[-1] - prev) / prev * 100
+
+
+class MACD(StreamingIndicator):
+    def __init__(self, window_slow=26, window_fast=12):
+        self.slow = EMA(span=window_slow)
+        self.fast = EMA(span=window_fast)
+
+    def update(self, bar):
+        return self.fast.update(bar) - self.slow.update(bar)
+
+
+class OBV(StreamingIndicator):
+    def __init__(self):
+        self.prev = None
+        self.value = 0.0
+
+    def update(self, bar):
+        close, volume = bar["close"], bar["volume"]
+        if self.prev is not None and close < self.prev:
+            self.value -= volume
+        else:
+            self.value += volume
+        self.prev = close
+        return self.value
+
+
+class TSI(StreamingIndicator):
+    def __init__(self, window_slow=25, window_fast=13, field="high"):
+        self.field = field
+        self.prev = None
+        self.slow = EMA(span=window_slow)
+        self.fast = EMA(span=window_fast)
+        self.slow_abs = EMA(span=window_slow)
+        self.fast_abs = EMA(span=window_fast)
+
+    def update(self, bar):
+        x = bar[self.field]
+        diff = nan if self.prev is None else x - self.prev
+        self.prev = x
+        smoothed = self.fast.push(self.slow.push(diff))
+        smoothed_abs = self.fast_abs.push(self.slow_abs.push(abs(diff)))
+        if math.isnan(smoothed) or math.isnan(smoothed_abs):
+            return nan
+        return smoothed / smoothed_abs * 100
+
+
+class ATR(StreamingIndicator):
+    # Wilder smoothing seeded with the mean of the first `window` true ranges,
+    # zeros before that like ta
+    def __init__(self, window=14):
+        self.window = window
+        self.prev = None
+        self.count = 0
+        self.seed = 0.0
+        self.value = 0.0
+
+    def update(self, bar):
+        high, low = bar["high"], bar["low"]
+        tr = high - low
+        if self.prev is not None:
+            tr = max(tr, abs(high - self.prev), abs(low - self.prev))
+        self.prev = bar["close"]
+        self.count += 1
+        if self.count < self.window:
+            self.seed += tr
+            return 0.0
+        if self.count == self.window:
+            self.value = (self.seed + tr) / self.window
+        else:
+            self.value = (self.value * (self.window - 1) + tr) / self.window
+        return self.value
+
+
+class CCI(StreamingIndicator):
+    # the mean deviation needs the whole window, so each update costs
+    # O(window), independent of the length of the history
+    def __init__(self, window=14, constant=0.015):
+        self.constant = constant
+        self.typical = deque(maxlen=window)
+
+    def update(self, bar):
+        typical = (bar["high"] + bar["low"] + bar["close"]) / 3.0
+        self.typical.append(typical)
+        if len(self.typical) < self.typical.maxlen:
+            return nan
+        mean = sum(self.typical) / len(self.typical)
+        mad = sum(abs(x - mean) for x in self.typical) / len(self.typical)
+        if mad == 0:
+            return nan if typical == mean else math.copysign(math.inf, typical - mean)
+        return (typical - mean) / (self.constant * mad)
+
+
+indicators = {
+    cls.__name__: cls
+    for cls in (EMA, SMA, Bollinger, RSI, ROC, MACD, OBV, TSI, ATR, CCI)
+}
+
+
+def restore(checkpoint):
+    indicator = indicators[checkpoint["type"]].__new__(
+        indicators[checkpoint["type"]]
+    )
+    for key, value in checkpoint["state"].items():
+        if isinstance(value, dict) and "indicator" in value:
+            value = restore(value["indicator"])
+        elif isinstance(value, dict) and "deque" in value:
+            value = deque(value["deque"], maxlen=value["maxlen"])
+        setattr(indicator, key, value)
+    return indicator
+
+
+stream_studies = {
+    "RSI_trace": lambda: RSI(14),
+    "ROC_trace": lambda: ROC(12),
+    "MACD_trace": lambda: MACD(26, 12),
+    "OBV_trace": OBV,
+    "TSI_trace": lambda: TSI(25, 13),
+    "ATR_trace": lambda: ATR(14),
+    "CCI_trace": lambda: CCI(14, 0.015),
+    "EMA_trace": lambda: EMA(span=12),
+    "SMA_trace": lambda: SMA(12),
+    "BOLLINGER_trace": lambda: Bollinger(20, 2),
+}
+
+
+class IndicatorStream:
+    # Keeps the selected studies of one series up to date bar by bar. Passing
+    # replace=True revises the last bar (a minute that is still forming)
+    # from the checkpoint taken before it, so one checkpoint is taken per new
+    # bar and none per revision.
+    def __init__(self, names):
+        self.indicators = {name: stream_studies[name]() for name in names}
+        self._before_last = None
+
+    def seed(self, df):
+        rows = df[["open", "high", "low", "close", "volume"]].to_dict("records")
+        for bar in rows[:-1]:
+            for indicator in self.indicators.values():
+                indicator.update(bar)
+        if rows:
+            return self.update(rows[-1])
+        return {}
+
+    def update(self, bar, replace=False):
+        if replace and self._before_last is not None:
+            self.indicators = {
+                name: restore(state) for name, state in self._before_last.items()
+            }
+        else:
+            self._before_last = self.checkpoint()
+        return {name: ind.update(bar) for name, ind in self.indicators.items()}
+
+    def checkpoint(self):
+        return {name: ind.checkpoint() for name, ind in self.indicators.items()}
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint):
+        stream = cls([])
+        stream.indicators = {
+            name: restore(state) for name, state in checkpoint.items()
+        }
+        return stream
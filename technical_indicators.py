@@ -1,55 +1,65 @@
-from ta import momentum, trend, volatility, volume
-import plotly.graph_objs as go
+import indicator_engine as engine
 
 
-def RSI_trace(df, window=14):
-    RSI_serie = momentum.rsi(df.close, window)
-    trace = go.Scatter(
+def RSI_trace(df, window=14, values=None, unit="days"):
+    RSI_serie = values
+    if RSI_serie is None:
+        RSI_serie = engine.rsi(df.close.to_numpy(dtype=float), window)
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=RSI_serie,
         mode="lines",
         showlegend=True,
-        name="RSI(14days)",
+        name="RSI(%d%s)" % (window, unit),
         line=dict(width=1, shape="linear", dash="solid", smoothing=0),
         hovertemplate="RSI: %{y:.4f}<extra></extra>",
     )
     return trace
 
 
-def ROC_trace(df, window=12):
-    ROC_serie = momentum.roc(df.close, window)
-    trace = go.Scatter(
+def ROC_trace(df, window=12, values=None, unit="days"):
+    ROC_serie = values
+    if ROC_serie is None:
+        ROC_serie = engine.roc(df.close.to_numpy(dtype=float), window)
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=ROC_serie,
         mode="lines",
         showlegend=True,
-        name="ROC(12days)",
+        name="ROC(%d%s)" % (window, unit),
         line=dict(width=1, shape="linear", dash="solid", smoothing=0),
         hovertemplate="ROC: %{y:.4f}<extra></extra>",
     )
     return trace
 
 
-def MACD_trace(df, window_s=26, window_f=12):
-    MACD_serie = trend.macd(df.close, window_s, window_f)
-    trace = go.Scatter(
+def MACD_trace(df, window_slow=26, window_fast=12, values=None, unit="days"):
+    MACD_serie = values
+    if MACD_serie is None:
+        MACD_serie = engine.macd(
+            df.close.to_numpy(dtype=float), window_slow, window_fast
+        )
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=MACD_serie,
         mode="lines",
         showlegend=True,
-        name="MACD(12days)",
+        name="MACD(%d%s)" % (window_fast, unit),
         line=dict(width=1, shape="linear", dash="solid", smoothing=0),
         hovertemplate="MACD: %{y:.4f}<extra></extra>",
     )
     return trace
 
 
-def BOLLINGER_trace(df, fig, window=20, window_dev=2):
-    BOLLINGER = volatility.BollingerBands(df.close, window, window_dev)
-    hband = BOLLINGER.bollinger_hband()
-    lband = BOLLINGER.bollinger_lband()
-    mband = BOLLINGER.bollinger_mavg()
-    trace_hband = go.Scatter(
+def BOLLINGER_trace(df, fig, window=20, window_dev=2, values=None):
+    if values is None:
+        values = engine.bollinger(df.close.to_numpy(dtype=float), window, window_dev)
+    hband, lband, mband = values
+    trace_hband = dict(
+        type="scatter",
         x=df.date,
         y=hband,
         mode="lines",
@@ -58,7 +68,8 @@ def BOLLINGER_trace(df, fig, window=20, window_dev=2):
         line=dict(width=1, shape="linear", dash="longdash", smoothing=0, color="gray"),
         hovertemplate="High Band: %{y:.4f}<extra></extra>",
     )
-    trace_lband = go.Scatter(
+    trace_lband = dict(
+        type="scatter",
         x=df.date,
         y=lband,
         mode="lines",
@@ -68,7 +79,8 @@ def BOLLINGER_trace(df, fig, window=20, window_dev=2):
         hovertemplate="Low Band: %{y:.4f}<extra></extra>",
         fill="tonexty",
     )
-    trace_mband = go.Scatter(
+    trace_mband = dict(
+        type="scatter",
         x=df.date,
         y=mband,
         mode="lines",
@@ -77,16 +89,19 @@ def BOLLINGER_trace(df, fig, window=20, window_dev=2):
         line=dict(width=1, shape="linear", dash="dashdot", smoothing=0, color="gray"),
         hovertemplate="Middle Band: %{y:.4f}<extra></extra>",
     )
-    fig.add_trace(trace_hband, row=1, col=1)
-    fig.add_trace(trace_lband, row=1, col=1)
-    fig.add_trace(trace_mband, row=1, col=1)
+    fig["data"].extend((trace_hband, trace_lband, trace_mband))
 
     return fig
 
 
-def OBV_trace(df):
-    OBV_serie = volume.on_balance_volume(df.close, df.volume)
-    trace = go.Scatter(
+def OBV_trace(df, values=None):
+    OBV_serie = values
+    if OBV_serie is None:
+        OBV_serie = engine.obv(
+            df.close.to_numpy(dtype=float), df.volume.to_numpy(dtype=float)
+        )
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=OBV_serie,
         mode="lines",
@@ -98,9 +113,14 @@ def OBV_trace(df):
     return trace
 
 
-def TSI_trace(df, window_s=25, window_f=13):
-    TSI_serie = momentum.tsi(df.high, window_s, window_f)
-    trace = go.Scatter(
+def TSI_trace(df, window_slow=25, window_fast=13, source="high", values=None):
+    TSI_serie = values
+    if TSI_serie is None:
+        TSI_serie = engine.tsi(
+            df[source].to_numpy(dtype=float), window_slow, window_fast
+        )
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=TSI_serie,
         mode="lines",
@@ -112,56 +132,72 @@ def TSI_trace(df, window_s=25, window_f=13):
     return trace
 
 
-def ATR_trace(df, window=14):
-    ATR_serie = volatility.average_true_range(df.high, df.low, df.close, window)
-    trace = go.Scatter(
+def ATR_trace(df, window=14, values=None, unit="days"):
+    ATR_serie = values
+    if ATR_serie is None:
+        data = engine.ohlcv(df)
+        ATR_serie = engine.atr(data["high"], data["low"], data["close"], window)
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=ATR_serie,
         mode="lines",
         showlegend=True,
-        name="ATR(14days)",
+        name="ATR(%d%s)" % (window, unit),
         line=dict(width=1, shape="linear", dash="solid", smoothing=0),
         hovertemplate="ATR: %{y:.4f}<extra></extra>",
     )
     return trace
 
 
-def CCI_trace(df, window=14, constant=0.015):
-    CCI_serie = trend.cci(df.high, df.low, df.close, window, constant)
-    trace = go.Scatter(
+def CCI_trace(df, window=14, constant=0.015, values=None, unit="days"):
+    CCI_serie = values
+    if CCI_serie is None:
+        data = engine.ohlcv(df)
+        CCI_serie = engine.cci(
+            data["high"], data["low"], data["close"], window, constant
+        )
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=CCI_serie,
         mode="lines",
         showlegend=True,
-        name="CCI(14days)",
+        name="CCI(%d%s)" % (window, unit),
         line=dict(width=1, shape="linear", dash="solid", smoothing=0),
         hovertemplate="CCI: %{y:.4f}<extra></extra>",
     )
     return trace
 
 
-def EMA_trace(df, window=12):
-    EMA_serie = trend.ema_indicator(df.close, window)
-    trace = go.Scatter(
+def EMA_trace(df, window=12, values=None, unit="days"):
+    EMA_serie = values
+    if EMA_serie is None:
+        EMA_serie = engine.ema(df.close.to_numpy(dtype=float), window)
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=EMA_serie,
         mode="lines",
         showlegend=True,
-        name="EMA(12days)",
+        name="EMA(%d%s)" % (window, unit),
         line=dict(width=1, shape="linear", dash="solid", smoothing=0),
         hovertemplate="EMA: %{y:.4f}<extra></extra>",
     )
     return trace
 
 
-def SMA_trace(df, window=12):
-    SMA_serie = trend.sma_indicator(df.close, window)
-    trace = go.Scatter(
+def SMA_trace(df, window=12, values=None, unit="days"):
+    SMA_serie = values
+    if SMA_serie is None:
+        SMA_serie = engine.sma(df.close.to_numpy(dtype=float), window)
+    trace = dict(
+        type="scatter",
         x=df.date,
         y=SMA_serie,
         mode="lines",
         showlegend=True,
-        name="SMA(12days)",
+        name="SMA(%d%s)" % (window, unit),
         line=dict(width=1, shape="linear", dash="solid", smoothing=0),
         hovertemplate="SMA: %{y:.4f}<extra></extra>",
     )
@@ -0,0 +1,44 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utilities import rand_agent
+
+
+TIMEOUT = (3.05, 10)
+# the forecasting api runs on a dyno that may need to wake up first
+MODEL_TIMEOUT = (3.05, 60)
+POOL_HOSTS = 10
+POOL_SIZE = 20
+
+
+def make_session(retries=3, backoff=0.3):
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET", "OPTIONS"],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+session = make_session()
+
+
+def request(method, url, headers=None, timeout=TIMEOUT, **kwargs):
+    headers = dict(headers or {})
+    headers.setdefault("User-Agent", rand_agent("assets/user-agents.txt"))
+    return session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
@@ -1,9 +1,15 @@
 import random
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def load_agents(fname):
+    with open(fname) as f:
+        return tuple(line for line in f.read().splitlines() if line)
 
 
 def rand_agent(fname):
-    lines = open(fname).read().splitlines()
-    return random.choice(lines)
+    return random.choice(load_agents(fname))
 
 
 def human_format(num):